@@ -5,7 +5,18 @@ from http import HTTPStatus
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 
-from app_todo_list.routers import auth, todos, users
+from app_todo_list.lifespan import lifespan
+from app_todo_list.metrics import MetricsMiddleware
+from app_todo_list.profiling import ProfilingMiddleware
+from app_todo_list.replica import ReadYourWritesMiddleware
+from app_todo_list.routers import (
+    auth,
+    health,
+    metrics,
+    profiles,
+    todos,
+    users,
+)
 from app_todo_list.schemas import Message
 
 if sys.platform == 'win32':
@@ -14,11 +25,18 @@ if sys.platform == 'win32':
 app = FastAPI(
     title='To-Do List - API',
     version='DEV',
+    lifespan=lifespan,
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(todos.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(profiles.router)
 
 
 @app.get(
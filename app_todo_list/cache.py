@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from time import monotonic
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float, timer=monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = item
+        if expires_at <= self.timer():
+            del self._items[key]
+            self.misses += 1
+            self.evictions += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+
+        self._items[key] = (value, self.timer() + ttl)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key):
+        item = self._items.pop(key, None)
+        return item[0] if item else None
+
+    def discard_where(self, predicate):
+        for key in [k for k, (v, _) in self._items.items() if predicate(v)]:
+            del self._items[key]
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
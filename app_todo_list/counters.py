@@ -0,0 +1,62 @@
+import asyncio
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app_todo_list.database import engine
+from app_todo_list.models import Todo, TodoState, TodoStateCount
+
+
+async def todo_state_counts(
+    session: AsyncSession, user_id: int, *, live: bool = False
+) -> dict[TodoState, int]:
+    if live:
+        query = (
+            select(Todo.state, func.count())
+            .where(Todo.user_id == user_id)
+            .group_by(Todo.state)
+        )
+    else:
+        query = select(TodoStateCount.state, TodoStateCount.count).where(
+            TodoStateCount.user_id == user_id
+        )
+
+    counts = dict.fromkeys(TodoState, 0)
+    counts.update((await session.execute(query)).tuples().all())
+    return counts
+
+
+async def rebuild_todo_state_counts(
+    session: AsyncSession, user_id: int | None = None
+) -> int:
+    # Bloqueia escritas em todos até o commit para os contadores não divergirem
+    await session.execute(text('LOCK TABLE todos IN SHARE MODE'))
+
+    counters = delete(TodoStateCount)
+    todos = select(Todo.user_id, Todo.state, func.count()).group_by(
+        Todo.user_id, Todo.state
+    )
+    if user_id is not None:
+        counters = counters.where(TodoStateCount.user_id == user_id)
+        todos = todos.where(Todo.user_id == user_id)
+
+    await session.execute(counters)
+    rows = await session.execute(
+        insert(TodoStateCount)
+        .from_select(['user_id', 'state', 'count'], todos)
+        .returning(TodoStateCount.user_id)
+    )
+    rebuilt = len(rows.all())
+    await session.commit()
+
+    return rebuilt
+
+
+async def main():  # pragma: no cover
+    async with AsyncSession(engine) as session:
+        rows = await rebuild_todo_state_counts(session)
+    print(f'{rows} contadores reconstruídos')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    asyncio.run(main())
@@ -1,10 +1,59 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
 
-from app_todo_list.settings import Settings
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 
-setting = Settings()
+from app_todo_list.settings import Settings, get_settings
 
-engine = create_async_engine(setting.DATABASE_URL)
+setting = get_settings()
+
+
+def create_engine_from_settings(url: str, settings: Settings) -> AsyncEngine:
+    connect_args = {}
+    if settings.DB_TRANSACTION_POOLER:
+        # PgBouncer em modo transaction não suporta prepared statements
+        connect_args['prepare_threshold'] = None
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+engine = create_engine_from_settings(setting.DATABASE_URL, setting)
+
+
+def pool_stats(engine: AsyncEngine = engine) -> dict:
+    pool = engine.pool
+    return {
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+    }
+
+
+async def prewarm_pool(count: int, engine: AsyncEngine = engine) -> int:
+    count = min(count, engine.pool.size())
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(count)), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    for result in results:
+        if not isinstance(result, Exception):
+            await result.close()
+
+    if errors:
+        raise errors[0]
+    return count
 
 
 async def get_session():  # pragma: no cover
@@ -0,0 +1,16 @@
+from hashlib import blake2b
+
+
+def make_etag(*parts) -> str:
+    raw = '|'.join(map(str, parts)).encode()
+    return f'"{blake2b(raw, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in {
+        tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+    }
@@ -0,0 +1,134 @@
+import csv
+
+from pydantic import ValidationError
+
+from app_todo_list.schemas import ExportFormat, TodoSchema
+from app_todo_list.settings import get_settings
+
+settings = get_settings()
+
+
+def decode_line(line: bytes) -> str | ValueError:
+    if len(line) > settings.TODO_IMPORT_MAX_LINE_BYTES:
+        return ValueError(
+            f'Linha maior que {settings.TODO_IMPORT_MAX_LINE_BYTES} bytes'
+        )
+    try:
+        return line.decode('utf-8')
+    except UnicodeDecodeError:
+        return ValueError('Linha não está em UTF-8')
+
+
+async def iter_lines(chunks):
+    """Linhas do corpo em str; as inválidas chegam como ValueError."""
+    pending, skipping = b'', False
+    async for chunk in chunks:
+        # \n nunca aparece dentro de um caractere UTF-8 de vários bytes, e
+        # o \r fica na linha: o JSON o aceita e o csv o trata entre aspas
+        *lines, pending = (pending + chunk).split(b'\n')
+        if lines and skipping:
+            # Resto de uma linha longa demais, que já virou erro
+            lines, skipping = lines[1:], False
+        for line in lines:
+            yield decode_line(line)
+
+        if skipping or len(pending) > settings.TODO_IMPORT_MAX_LINE_BYTES:
+            if not skipping:
+                yield decode_line(pending)
+            pending, skipping = b'', True
+
+    if pending and not skipping:
+        yield decode_line(pending)
+
+
+async def ndjson_records(lines):
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if isinstance(line, ValueError) or line.strip():
+            yield line_number, line
+
+
+async def csv_records(lines):
+    header = None
+    record, record_line, line_number = [], 0, 0
+    async for line in lines:
+        line_number += 1
+        if isinstance(line, ValueError):
+            # Descarta o registro em andamento: as aspas dele se perderam
+            record = []
+            yield line_number, line
+            continue
+        if not record:
+            record_line = line_number
+        record.append(line)
+
+        # Aspas em número ímpar: o campo continua na próxima linha
+        text = '\n'.join(record)
+        if text.count('"') % 2:
+            limit = settings.TODO_IMPORT_MAX_LINE_BYTES
+            if len(text) > limit:
+                record = []
+                yield (
+                    record_line,
+                    ValueError(f'Registro maior que {limit} bytes'),
+                )
+            continue
+        record = []
+
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        yield record_line, dict(zip(header, values))
+
+    if record:
+        yield record_line, '\n'.join(record)
+
+
+def checked(validate):
+    def validate_record(record):
+        if isinstance(record, ValueError):
+            raise record
+        return validate(record)
+
+    return validate_record
+
+
+IMPORT_FORMATS = {
+    ExportFormat.ndjson: (
+        ndjson_records,
+        checked(TodoSchema.model_validate_json),
+    ),
+    ExportFormat.csv: (csv_records, checked(TodoSchema.model_validate)),
+}
+
+
+def validation_detail(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return '; '.join(
+            f'{".".join(map(str, e["loc"])) or "linha"}: {e["msg"]}'
+            for e in error.errors(include_url=False)
+        )
+    return str(error)
+
+
+async def copy_todos(session, user_id: int, todos: list[TodoSchema]):
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+
+    async with raw_connection.driver_connection.cursor() as cursor:
+        async with cursor.copy(
+            'COPY todos (title, description, state, user_id) FROM STDIN'
+        ) as copy:
+            for todo in todos:
+                await copy.write_row((
+                    todo.title,
+                    todo.description,
+                    todo.state.value,
+                    user_id,
+                ))
+
+    await session.commit()
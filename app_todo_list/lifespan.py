@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app_todo_list import replica
+from app_todo_list.database import engine, prewarm_pool, setting
+from app_todo_list.security import shutdown_hash_executor, warm_up
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_app(app):
+    engines = [engine]
+    if replica.read_engine is not None:
+        engines.append(replica.read_engine)
+
+    for pool_engine in engines:
+        try:
+            opened = await prewarm_pool(setting.DB_POOL_PREWARM, pool_engine)
+            logger.info('%s: %d conexões pré-abertas', pool_engine.url, opened)
+        except OSError, SQLAlchemyError:
+            # Sem pré-aquecimento as conexões só abrem sob demanda
+            logger.exception(
+                'Falha ao pré-aquecer o pool de %s', pool_engine.url
+            )
+
+    try:
+        await warm_up()
+    except Exception:
+        # Aquecer é só otimização: sem ele o primeiro login paga o custo
+        logger.exception('Falha ao aquecer os hashers de senha')
+
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up_app(app))
+
+    yield
+
+    warm_up_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warm_up_task
+
+    await engine.dispose()
+    if replica.read_engine is not None:
+        await replica.read_engine.dispose()
+    shutdown_hash_executor()
@@ -0,0 +1,205 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+registry = []
+request_statements = ContextVar('request_statements', default=None)
+
+
+def format_labels(labelnames, values) -> str:
+    if not labelnames:
+        return ''
+
+    def escape(value):
+        return (
+            str(value)
+            .replace('\\', r'\\')
+            .replace('"', r'\"')
+            .replace('\n', r'\n')
+        )
+
+    pairs = (
+        f'{name}="{escape(value)}"' for name, value in zip(labelnames, values)
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+def format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        registry.append(self)
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def clear(self):
+        self._series.clear()
+
+    def samples(self):
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (
+                    '_bucket',
+                    (*self.labelnames, 'le'),
+                    (*labels, format_value(float(bound))),
+                    cumulative,
+                )
+            yield '_bucket', (*self.labelnames, 'le'), (*labels, '+Inf'), count
+            yield '_sum', self.labelnames, labels, total
+            yield '_count', self.labelnames, labels, count
+
+
+class CallbackMetric:
+    """Métrica lida no momento do scrape a partir de `collect()`."""
+
+    def __init__(self, name, documentation, type, labelnames, collect):
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        registry.append(self)
+
+    def samples(self):
+        for labels, value in self.collect():
+            yield '', self.labelnames, labels, value
+
+
+def render(metrics=None, const_labels=None) -> str:
+    const_names = tuple(const_labels or ())
+    const_values = tuple((const_labels or {}).values())
+    lines = []
+    for metric in registry if metrics is None else metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines.extend(
+            f'{metric.name}{suffix}'
+            f'{format_labels(const_names + names, const_values + labels)} '
+            f'{format_value(value)}'
+            for suffix, names, labels, value in metric.samples()
+        )
+    return '\n'.join(lines) + '\n'
+
+
+http_request_duration = Histogram(
+    'http_request_duration_seconds',
+    'Latência das requisições HTTP por rota.',
+    ('method', 'route', 'status'),
+)
+http_request_statements = Histogram(
+    'http_request_db_statements',
+    'Quantidade de comandos SQL executados por requisição.',
+    ('method', 'route'),
+    buckets=STATEMENT_BUCKETS,
+)
+db_statement_duration = Histogram(
+    'db_statement_duration_seconds',
+    'Duração dos comandos SQL por tipo de comando.',
+    ('statement',),
+)
+password_hash_duration = Histogram(
+    'password_hash_duration_seconds',
+    'Tempo gasto no Argon2 por operação.',
+    ('operation',),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+password_hash_queue_wait = Histogram(
+    'password_hash_queue_wait_seconds',
+    'Espera na fila do executor de hash por operação.',
+    ('operation',),
+)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_statement_timer(conn, cursor, statement, parameters, context, *_):
+    if context is not None:
+        context.metrics_started_at = perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def observe_statement(conn, cursor, statement, parameters, context, *_):
+    started_at = getattr(context, 'metrics_started_at', None)
+    if started_at is not None:
+        keyword = statement.lstrip().split(None, 1)[0].upper()
+        db_statement_duration.observe(perf_counter() - started_at, keyword)
+
+    if (statements := request_statements.get()) is not None:
+        statements[0] += 1
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        started_at = perf_counter()
+        status = [500]
+        statements = [0]
+        token = request_statements.set(statements)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_statements.reset(token)
+            route = scope.get('route')
+            path = getattr(route, 'path', 'unmatched')
+            http_request_duration.observe(
+                perf_counter() - started_at,
+                scope['method'],
+                path,
+                str(status[0]),
+            )
+            http_request_statements.observe(
+                statements[0], scope['method'], path
+            )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import DDL, ForeignKey, Index, UniqueConstraint, event, func
 from sqlalchemy.orm import (
     Mapped,
     mapped_as_dataclass,
@@ -24,10 +24,15 @@ class TodoState(str, Enum):
 @mapped_as_dataclass(table_registry)
 class User:
     __tablename__ = 'users'
+    __table_args__ = (
+        UniqueConstraint('username', name='users_username_key'),
+        UniqueConstraint('email', name='users_email_key'),
+    )
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
-    username: Mapped[str] = mapped_column(unique=True)
-    email: Mapped[str] = mapped_column(unique=True)
+    username: Mapped[str]
+    email: Mapped[str]
     password: Mapped[str]
     created_at: Mapped[datetime] = mapped_column(
         init=False,
@@ -40,13 +45,36 @@ class User:
     todos: Mapped[list[Todo]] = relationship(
         init=False,
         cascade='all, delete-orphan',
-        lazy='selectin',
+        lazy='raise',
     )
 
 
 @mapped_as_dataclass(table_registry)
 class Todo:
     __tablename__ = 'todos'
+    __mapper_args__ = {'eager_defaults': True}
+    __table_args__ = (
+        Index('ix_todos_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index(
+            'ix_todos_user_id_state_created_at_id',
+            'user_id',
+            'state',
+            'created_at',
+            'id',
+        ),
+        Index(
+            'ix_todos_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_todos_description_trgm',
+            'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
@@ -61,3 +89,81 @@ class Todo:
     )
 
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+
+
+@mapped_as_dataclass(table_registry)
+class TodoStateCount:
+    __tablename__ = 'todo_state_counts'
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
+    )
+    state: Mapped[TodoState] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0)
+
+
+TODO_STATE_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_state_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_state_counts AS counts (user_id, state, count)
+        SELECT user_id, state, count(*) FROM new_rows
+        GROUP BY user_id, state
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = counts.count + excluded.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO todo_state_counts AS counts (user_id, state, count)
+        SELECT user_id, state, -count(*) FROM old_rows
+        GROUP BY user_id, state
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = counts.count + excluded.count;
+    ELSE
+        INSERT INTO todo_state_counts AS counts (user_id, state, count)
+        SELECT user_id, state, sum(delta) FROM (
+            SELECT user_id, state, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT user_id, state, -1 AS delta FROM old_rows
+        ) AS changes
+        GROUP BY user_id, state
+        HAVING sum(delta) <> 0
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = counts.count + excluded.count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TODO_STATE_COUNTS_TRIGGERS = (
+    """
+    CREATE TRIGGER todos_state_counts_insert AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todo_state_counts_apply()
+    """,
+    """
+    CREATE TRIGGER todos_state_counts_update AFTER UPDATE ON todos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todo_state_counts_apply()
+    """,
+    """
+    CREATE TRIGGER todos_state_counts_delete AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todo_state_counts_apply()
+    """,
+)
+
+
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'),
+)
+
+
+event.listen(Todo.__table__, 'after_create', DDL(TODO_STATE_COUNTS_FUNCTION))
+for trigger in TODO_STATE_COUNTS_TRIGGERS:
+    event.listen(Todo.__table__, 'after_create', DDL(trigger))
@@ -0,0 +1,52 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class CountMode(str, Enum):
+    exact = 'exact'
+    estimated = 'estimated'
+    none = 'none'
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def compile_explain(element, compiler, **kw):
+    return f'EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}'
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = f'{created_at.isoformat()}|{id}'.encode()
+    return urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(id)
+    except ValueError as error:
+        raise ValueError('Cursor inválido') from error
+
+
+async def count_rows(session, query, mode: CountMode) -> int | None:
+    if mode == CountMode.exact:
+        return await session.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
+
+    if mode == CountMode.estimated:
+        plan = await session.scalar(Explain(query))
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    return None
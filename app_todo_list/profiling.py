@@ -0,0 +1,143 @@
+import asyncio
+import cProfile
+import itertools
+import random
+import re
+import time
+from hmac import compare_digest
+from http import HTTPStatus
+from pathlib import Path
+from typing import Annotated
+from uuid import uuid4
+
+from fastapi import Header, HTTPException
+
+from app_todo_list.settings import get_settings
+
+settings = get_settings()
+
+PROFILE_ID = re.compile(r'^[\w-]+\.prof$')
+PROFILE_HEADER = 'X-Profile-Token'
+
+_active = {'profiling': False}
+# Desempata profiles do mesmo segundo sem depender da precisão do mtime
+_sequence = itertools.count()
+
+
+def profiles_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def has_profiling_token(token: str | None) -> bool:
+    return bool(
+        settings.PROFILING_TOKEN
+        and token
+        and compare_digest(token, settings.PROFILING_TOKEN)
+    )
+
+
+def should_profile(scope) -> bool:
+    if not settings.PROFILING_ENABLED or scope['path'].startswith('/profiles'):
+        return False
+
+    headers = dict(scope['headers'])
+    token = headers.get(PROFILE_HEADER.lower().encode())
+    if has_profiling_token(token.decode() if token else None):
+        return True
+
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def new_profile_id(scope) -> str:
+    slug = re.sub(r'\W+', '_', scope['path']).strip('_')[:40] or 'root'
+    timestamp = time.strftime('%Y%m%dT%H%M%S')
+    sequence = next(_sequence)
+    return (
+        f'{timestamp}-{sequence:08d}-{scope["method"]}-{slug}-'
+        f'{uuid4().hex[:8]}.prof'
+    )
+
+
+def save_profile(profiler: cProfile.Profile, profile_id: str):
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / profile_id)
+    prune_profiles(directory, settings.PROFILING_MAX_FILES)
+
+
+def list_profiles(directory: Path) -> list[Path]:
+    # O id começa pelo horário e pela sequência: a ordem do nome é a de criação
+    return sorted(
+        directory.glob('*.prof'), key=lambda path: path.name, reverse=True
+    )
+
+
+def prune_profiles(directory: Path, keep: int):
+    for path in list_profiles(directory)[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def profile_path(profile_id: str) -> Path:
+    path = profiles_dir() / profile_id
+    if not PROFILE_ID.match(profile_id) or not path.is_file():
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Profile não encontrado'
+        )
+    return path
+
+
+def require_profiling_token(
+    x_profile_token: Annotated[str | None, Header()] = None,
+):
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Profiling desabilitado'
+        )
+
+    if not has_profiling_token(x_profile_token):
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail='Token de profiling inválido',
+        )
+
+
+class ProfilingMiddleware:
+    """Roda a requisição sob cProfile e salva o resultado em disco.
+
+    Só um profile por vez: com o event loop intercalando requisições, o
+    cProfile também mede o que as outras corrotinas executarem no meio.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope['type'] != 'http'
+            or _active['profiling']
+            or not should_profile(scope)
+        ):
+            return await self.app(scope, receive, send)
+
+        profile_id = new_profile_id(scope)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (b'x-profile-id', profile_id.encode()),
+                ]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        _active['profiling'] = True
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+                # Gravar e podar o diretório é I/O bloqueante: fora do loop
+                await asyncio.to_thread(save_profile, profiler, profile_id)
+        finally:
+            _active['profiling'] = False
@@ -0,0 +1,97 @@
+import asyncio
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app_todo_list.cache import TTLCache
+from app_todo_list.database import (
+    create_engine_from_settings,
+    get_session,
+    setting,
+)
+from app_todo_list.schemas import UserPrincipal
+from app_todo_list.security import get_current_user
+
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+read_engine = (
+    create_engine_from_settings(setting.READ_DATABASE_URL, setting)
+    if setting.READ_DATABASE_URL
+    else None
+)
+replica_health = TTLCache(maxsize=1, ttl=setting.READ_REPLICA_CHECK_SECONDS)
+recent_writers = TTLCache(
+    maxsize=setting.READ_AFTER_WRITE_CACHE_SIZE,
+    ttl=setting.READ_AFTER_WRITE_SECONDS,
+)
+
+
+async def replica_available(engine: AsyncEngine) -> bool:
+    healthy = replica_health.get(engine.url)
+    if healthy is not None:
+        return healthy
+
+    try:
+        async with asyncio.timeout(setting.READ_REPLICA_CHECK_TIMEOUT):
+            async with engine.connect() as conn:
+                lag = await conn.scalar(REPLICA_LAG_QUERY)
+        healthy = lag is not None and (
+            lag <= setting.READ_REPLICA_MAX_LAG_SECONDS
+        )
+    except OSError, TimeoutError, SQLAlchemyError:
+        healthy = False
+
+    replica_health.set(engine.url, healthy)
+    return healthy
+
+
+async def get_read_session(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[UserPrincipal, Depends(get_current_user)],
+):
+    if (
+        read_engine is None
+        or recent_writers.get(user.id)
+        or not await replica_available(read_engine)
+    ):
+        yield session
+        return
+
+    async with AsyncSession(
+        read_engine, expire_on_commit=False
+    ) as read_session:
+        yield read_session
+
+
+class ReadYourWritesMiddleware:
+    """Fixa no primário, por alguns segundos, quem acabou de escrever."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                principal = scope.get('state', {}).get('principal')
+                if principal and message['status'] < HTTPStatus.BAD_REQUEST:
+                    recent_writers.set(principal.id, True)
+            await send(message)
+
+        return await self.app(scope, receive, send_wrapper)
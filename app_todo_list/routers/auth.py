@@ -8,11 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_todo_list.database import get_session
 from app_todo_list.models import User
-from app_todo_list.schemas import Token
+from app_todo_list.schemas import Token, UserPrincipal
 from app_todo_list.security import (
     create_access_token,
     get_current_user,
-    verify_password,
+    verify_password_async,
 )
 
 router = APIRouter(prefix='/auth', tags=['auth'])
@@ -33,7 +33,7 @@ async def login_for_access_token(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Usuário ou senha incorretos',
         )
-    if not verify_password(form_data.password, user.password):
+    if not await verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Usuário ou senha incorretos',
@@ -44,7 +44,7 @@ async def login_for_access_token(
 
 @router.post('/refresh', response_model=Token)
 async def refresh_access_token(
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserPrincipal, Depends(get_current_user)],
 ):
     new_access_token = create_access_token(data={'sub': str(user.id)})
     return Token(access_token=new_access_token, token_type='Bearer')
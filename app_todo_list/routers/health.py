@@ -0,0 +1,25 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app_todo_list.database import pool_stats
+from app_todo_list.schemas import Message, PoolStats
+
+router = APIRouter(prefix='/health', tags=['health'])
+
+
+@router.get('/pool', status_code=HTTPStatus.OK, response_model=PoolStats)
+async def read_pool_stats():
+    return pool_stats()
+
+
+@router.get('/ready', status_code=HTTPStatus.OK, response_model=Message)
+async def read_readiness(request: Request):
+    if not getattr(request.app.state, 'ready', False):
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail='Aquecendo',
+            headers={'Retry-After': '1'},
+        )
+
+    return {'message': 'Pronto'}
@@ -0,0 +1,83 @@
+import os
+from http import HTTPStatus
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app_todo_list import replica
+from app_todo_list.database import engine, pool_stats
+from app_todo_list.metrics import CallbackMetric, render
+from app_todo_list.security import password_hash_stats, principal_cache
+from app_todo_list.settings import get_settings
+
+router = APIRouter(tags=['metrics'])
+
+
+def collect_pool(key):
+    def collect():
+        engines = {'primary': engine, 'replica': replica.read_engine}
+        return [
+            ((name,), pool_stats(pool_engine)[key])
+            for name, pool_engine in engines.items()
+            if pool_engine is not None
+        ]
+
+    return collect
+
+
+for key in ('size', 'checked_in', 'checked_out', 'overflow'):
+    CallbackMetric(
+        f'db_pool_{key}',
+        f'Conexões do pool ({key}).',
+        'gauge',
+        ('pool',),
+        collect_pool(key),
+    )
+
+for key in ('hits', 'misses', 'evictions'):
+    CallbackMetric(
+        f'auth_principal_cache_{key}_total',
+        f'Cache de usuários autenticados ({key}).',
+        'counter',
+        (),
+        lambda key=key: [((), principal_cache.stats()[key])],
+    )
+
+CallbackMetric(
+    'auth_principal_cache_size',
+    'Entradas no cache de usuários autenticados.',
+    'gauge',
+    (),
+    lambda: [((), len(principal_cache))],
+)
+CallbackMetric(
+    'password_hash_pending',
+    'Hashes de senha aguardando ou em execução.',
+    'gauge',
+    (),
+    lambda: [((), password_hash_stats['pending'])],
+)
+CallbackMetric(
+    'password_hash_rejected_total',
+    'Hashes de senha recusados por fila cheia.',
+    'counter',
+    (),
+    lambda: [((), password_hash_stats['rejected'])],
+)
+
+
+@router.get(
+    '/metrics',
+    status_code=HTTPStatus.OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def read_metrics():
+    # Com vários workers, cada scrape cai em um processo diferente
+    const_labels = None
+    if get_settings().METRICS_WORKER_LABEL:
+        const_labels = {'worker': os.getpid()}
+    return PlainTextResponse(
+        render(const_labels=const_labels),
+        media_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,59 @@
+import io
+import pstats
+from datetime import datetime
+from http import HTTPStatus
+from typing import Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app_todo_list.profiling import (
+    list_profiles,
+    profile_path,
+    profiles_dir,
+    require_profiling_token,
+)
+from app_todo_list.schemas import ProfileList
+
+router = APIRouter(
+    prefix='/profiles',
+    tags=['profiles'],
+    dependencies=[Depends(require_profiling_token)],
+)
+
+
+@router.get('/', status_code=HTTPStatus.OK, response_model=ProfileList)
+async def read_profiles():
+    directory = profiles_dir()
+    paths = list_profiles(directory) if directory.is_dir() else []
+
+    profiles = []
+    for path in paths:
+        stat = path.stat()
+        profiles.append({
+            'id': path.name,
+            'size': stat.st_size,
+            'created_at': datetime.fromtimestamp(stat.st_mtime),
+        })
+
+    return {'profiles': profiles}
+
+
+@router.get('/{profile_id}', status_code=HTTPStatus.OK)
+async def read_profile(
+    profile_id: str,
+    format: Literal['pstats', 'text'] = 'pstats',
+    limit: int = 50,
+):
+    path = profile_path(profile_id)
+
+    if format == 'pstats':
+        return FileResponse(
+            path, media_type='application/octet-stream', filename=profile_id
+        )
+
+    output = io.StringIO()
+    pstats.Stats(str(path), stream=output).sort_stats(
+        'cumulative'
+    ).print_stats(limit)
+    return PlainTextResponse(output.getvalue())
@@ -1,26 +1,176 @@
+import csv
+import io
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+import orjson
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app_todo_list.counters import todo_state_counts
 from app_todo_list.database import get_session
-from app_todo_list.models import Todo, User
+from app_todo_list.etag import etag_matches, make_etag
+from app_todo_list.importer import (
+    IMPORT_FORMATS,
+    copy_todos,
+    iter_lines,
+    validation_detail,
+)
+from app_todo_list.models import Todo
+from app_todo_list.pagination import (
+    CountMode,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+)
+from app_todo_list.replica import get_read_session
 from app_todo_list.schemas import (
+    ExportFormat,
+    ExportTodo,
     FilterTodo,
+    FilterTodoBulk,
+    FilterTodoFields,
     Message,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoImportResult,
     TodoList,
     TodoPublic,
     TodoSchema,
+    TodoStats,
     TodoUpdate,
+    UserPrincipal,
 )
 from app_todo_list.security import get_current_user
+from app_todo_list.settings import get_settings
 
 router = APIRouter(prefix='/todos', tags=['todos'])
+settings = get_settings()
 
 Session = Annotated[AsyncSession, Depends(get_session)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_user)]
+
+TODO_PUBLIC_COLUMNS = (
+    Todo.title,
+    Todo.description,
+    Todo.state,
+    Todo.id,
+    Todo.created_at,
+    Todo.updated_at,
+)
+
+
+def filter_todos(query, user_id: int, todo_filter: FilterTodoFields):
+    query = query.where(Todo.user_id == user_id)
+
+    if todo_filter.title:
+        query = query.filter(Todo.title.contains(todo_filter.title))
+
+    if todo_filter.description:
+        query = query.filter(
+            Todo.description.contains(todo_filter.description)
+        )
+
+    if todo_filter.state:
+        query = query.filter(Todo.state == todo_filter.state)
+
+    return query
+
+
+def paginate_todos(query, todo_filter: FilterTodo):
+    query = query.order_by(Todo.created_at, Todo.id)
+
+    if todo_filter.cursor:
+        query = query.where(
+            tuple_(Todo.created_at, Todo.id)
+            > tuple_(*decode_cursor(todo_filter.cursor))
+        )
+    else:
+        query = query.offset(todo_filter.offset)
+
+    return query.limit(todo_filter.limit + 1)
+
+
+async def count_todos(
+    session: AsyncSession, user_id: int, todo_filter: FilterTodo
+) -> int | None:
+    text_filter = todo_filter.title or todo_filter.description
+    if todo_filter.count == CountMode.estimated and not text_filter:
+        # Sem filtro de texto os contadores por estado já dão o total exato
+        counts = await todo_state_counts(session, user_id)
+        if todo_filter.state:
+            return counts[todo_filter.state]
+        return sum(counts.values())
+
+    return await count_rows(
+        session,
+        filter_todos(select(Todo.id), user_id, todo_filter),
+        todo_filter.count,
+    )
+
+
+def todos_etag(
+    user_id: int, todo_filter: FilterTodo, versions, total: int | None
+) -> str:
+    # O total entra na ETag: mudanças fora da página alteram X-Total-Count
+    return make_etag(
+        user_id,
+        todo_filter.model_dump_json(),
+        total,
+        *(f'{id}:{updated_at.isoformat()}' for id, updated_at in versions),
+    )
+
+
+def dump_todo_list(rows, next_cursor: str | None) -> bytes:
+    return orjson.dumps({
+        'todos': [row._asdict() for row in rows],
+        'next_cursor': next_cursor,
+    })
+
+
+async def export_ndjson(result):
+    async for rows in result.partitions():
+        yield b''.join(orjson.dumps(row._asdict()) + b'\n' for row in rows)
+
+
+async def export_csv(result):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.key for column in TODO_PUBLIC_COLUMNS)
+
+    async for rows in result.partitions():
+        writer.writerows(
+            (
+                row.title,
+                row.description,
+                row.state.value,
+                row.id,
+                row.created_at.isoformat(),
+                row.updated_at.isoformat(),
+            )
+            for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+EXPORTERS = {
+    ExportFormat.ndjson: (export_ndjson, 'application/x-ndjson'),
+    ExportFormat.csv: (export_csv, 'text/csv'),
+}
 
 
 @router.post(
@@ -41,39 +191,245 @@ async def create_todo(
     )
     session.add(db_todo)
     await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
 
 
+@router.post(
+    '/bulk',
+    response_model=list[TodoPublic],
+    status_code=HTTPStatus.CREATED,
+)
+async def create_todos_bulk(
+    todos: Annotated[list[TodoSchema], Body(min_length=1)],
+    session: Session,
+    user: CurrentUser,
+):
+    if len(todos) > settings.TODO_BULK_MAX_SIZE:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=(
+                f'Máximo de {settings.TODO_BULK_MAX_SIZE} tarefas '
+                'por requisição'
+            ),
+        )
+
+    db_todos = await session.scalars(
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [{**todo.model_dump(), 'user_id': user.id} for todo in todos],
+    )
+    db_todos = db_todos.all()
+    await session.commit()
+
+    return db_todos
+
+
 @router.get(
     '/',
     response_model=TodoList,
     status_code=HTTPStatus.OK,
 )
 async def read_todos(
-    session: Session,
+    response: Response,
+    session: ReadSession,
     user: CurrentUser,
     todo_filter: Annotated[FilterTodo, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    query = select(Todo).where(Todo.user_id == user.id)
+    total = await count_todos(session, user.id, todo_filter)
+    if if_none_match:
+        versions = await session.execute(
+            paginate_todos(
+                filter_todos(
+                    select(Todo.id, Todo.updated_at), user.id, todo_filter
+                ),
+                todo_filter,
+            )
+        )
+        etag = todos_etag(user.id, todo_filter, versions.all(), total)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+            )
 
-    if todo_filter.title:
-        query = query.filter(Todo.title.contains(todo_filter.title))
+    fast = settings.TODO_FAST_SERIALIZATION
+    query = select(*TODO_PUBLIC_COLUMNS) if fast else select(Todo)
+    result = await session.execute(
+        paginate_todos(filter_todos(query, user.id, todo_filter), todo_filter)
+    )
+    todos = result.all() if fast else result.scalars().all()
+    etag = todos_etag(
+        user.id,
+        todo_filter,
+        [(todo.id, todo.updated_at) for todo in todos],
+        total,
+    )
 
-    if todo_filter.description:
-        query = query.filter(
-            Todo.description.contains(todo_filter.description)
+    next_cursor = None
+    if len(todos) > todo_filter.limit:
+        todos = todos[: todo_filter.limit]
+        next_cursor = encode_cursor(todos[-1].created_at, todos[-1].id)
+
+    headers = {'ETag': etag}
+    if total is not None:
+        headers['X-Total-Count'] = str(total)
+
+    if fast:
+        return Response(
+            content=dump_todo_list(todos, next_cursor),
+            media_type='application/json',
+            headers=headers,
         )
 
-    if todo_filter.state:
-        query = query.filter(Todo.state == todo_filter.state)
+    response.headers.update(headers)
+    return {'todos': todos, 'next_cursor': next_cursor}
+
+
+@router.get('/stats', status_code=HTTPStatus.OK, response_model=TodoStats)
+async def read_todo_stats(
+    session: ReadSession,
+    user: CurrentUser,
+    live: bool = False,
+):
+    counts = await todo_state_counts(session, user.id, live=live)
+    return {'counts': counts, 'total': sum(counts.values())}
+
+
+@router.get('/export', status_code=HTTPStatus.OK)
+async def export_todos(
+    session: ReadSession,
+    user: CurrentUser,
+    export: Annotated[ExportTodo, Query()],
+):
+    query = (
+        filter_todos(select(*TODO_PUBLIC_COLUMNS), user.id, export)
+        .order_by(Todo.created_at, Todo.id)
+        .execution_options(yield_per=settings.TODO_EXPORT_BATCH_SIZE)
+    )
+    exporter, media_type = EXPORTERS[export.format]
 
-    todos = await session.scalars(
-        query.limit(todo_filter.limit).offset(todo_filter.offset)
+    async def stream():
+        result = await session.stream(query)
+        try:
+            async for chunk in exporter(result):
+                yield chunk
+        finally:
+            await result.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="todos.{export.format.value}"'
+            )
+        },
     )
 
-    return {'todos': todos.all()}
+
+@router.post(
+    '/import',
+    status_code=HTTPStatus.OK,
+    response_model=TodoImportResult,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/x-ndjson': {'schema': {'type': 'string'}},
+                'text/csv': {'schema': {'type': 'string'}},
+            },
+        }
+    },
+)
+async def import_todos(
+    request: Request,
+    session: Session,
+    user: CurrentUser,
+    format: ExportFormat = ExportFormat.ndjson,
+):
+    records, validate = IMPORT_FORMATS[format]
+    imported, failed = 0, 0
+    batch, batches, errors = [], [], []
+
+    async def flush():
+        await copy_todos(session, user.id, batch)
+        batches.append({'batch': len(batches) + 1, 'rows': len(batch)})
+        batch.clear()
+
+    async for line, record in records(iter_lines(request.stream())):
+        try:
+            batch.append(validate(record))
+        except ValueError as error:
+            failed += 1
+            if len(errors) < settings.TODO_IMPORT_MAX_ERRORS:
+                errors.append({
+                    'line': line,
+                    'detail': validation_detail(error),
+                })
+            continue
+
+        imported += 1
+        if len(batch) >= settings.TODO_IMPORT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return {
+        'imported': imported,
+        'failed': failed,
+        'batches': batches,
+        'errors': errors,
+    }
+
+
+@router.patch(
+    '/bulk',
+    status_code=HTTPStatus.OK,
+    response_model=TodoBulkResult,
+)
+async def patch_todos_bulk(
+    session: Session,
+    user: CurrentUser,
+    bulk: TodoBulkUpdate,
+):
+    query = update(Todo).where(Todo.user_id == user.id)
+
+    if bulk.ids is not None:
+        query = query.where(Todo.id.in_(bulk.ids))
+
+    if bulk.from_state:
+        query = query.where(Todo.state == bulk.from_state)
+
+    query = query.values(**bulk.changes.model_dump(exclude_unset=True))
+    ids = (await session.scalars(query.returning(Todo.id))).all()
+    await session.commit()
+
+    return TodoBulkResult(count=len(ids), ids=ids)
+
+
+@router.delete(
+    '/bulk',
+    status_code=HTTPStatus.OK,
+    response_model=TodoBulkResult,
+)
+async def delete_todos_bulk(
+    session: Session,
+    user: CurrentUser,
+    todo_filter: Annotated[FilterTodoBulk, Query()],
+):
+    query = delete(Todo).where(Todo.user_id == user.id)
+
+    if todo_filter.ids is not None:
+        query = query.where(Todo.id.in_(todo_filter.ids))
+
+    if todo_filter.state:
+        query = query.where(Todo.state == todo_filter.state)
+
+    ids = (await session.scalars(query.returning(Todo.id))).all()
+    await session.commit()
+
+    return TodoBulkResult(count=len(ids), ids=ids)
 
 
 @router.delete(
@@ -86,17 +442,18 @@ async def delete_todo(
     user: CurrentUser,
     todo_id: int,
 ):
-    todo = await session.scalar(
-        select(Todo).where(Todo.id == todo_id, Todo.user_id == user.id)
+    deleted_id = await session.scalar(
+        delete(Todo)
+        .where(Todo.id == todo_id, Todo.user_id == user.id)
+        .returning(Todo.id)
     )
 
-    if not todo:
+    if not deleted_id:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Tarefa não encontrada',
         )
 
-    await session.delete(todo)
     await session.commit()
 
     return Message(message='Tarefa deletada com sucesso')
@@ -113,8 +470,13 @@ async def patch_todo(
     todo_id: int,
     todo: TodoUpdate,
 ):
+    query = select(Todo)
+    changes = todo.model_dump(exclude_unset=True)
+    if changes:
+        query = update(Todo).values(**changes).returning(Todo)
+
     db_todo = await session.scalar(
-        select(Todo).where(Todo.id == todo_id, Todo.user_id == user.id)
+        query.where(Todo.id == todo_id, Todo.user_id == user.id)
     )
 
     if not db_todo:
@@ -123,11 +485,6 @@ async def patch_todo(
             detail='Tarefa não encontrada',
         )
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
-        setattr(db_todo, key, value)
-
-    session.add(db_todo)
     await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
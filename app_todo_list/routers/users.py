@@ -1,61 +1,81 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_todo_list.database import get_session
-from app_todo_list.models import User
+from app_todo_list.etag import etag_matches, make_etag
+from app_todo_list.models import Todo, User
+from app_todo_list.pagination import count_rows
+from app_todo_list.replica import get_read_session
 from app_todo_list.schemas import (
     FilterPage,
     Message,
     UserList,
+    UserPrincipal,
     UserPublic,
     UserSchema,
 )
-from app_todo_list.security import get_current_user, get_password_hash
+from app_todo_list.security import (
+    get_current_user,
+    get_password_hash_async,
+    invalidate_principal,
+)
 
 router = APIRouter(prefix='/users', tags=['users'])
 Session = Annotated[AsyncSession, Depends(get_session)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_user)]
+CONFLICT_DETAILS = {
+    'users_username_key': 'Username já existe',
+    'users_email_key': 'Email já existe',
+}
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
 async def create_user(user: UserSchema, session: Session):
-    db_user = await session.scalar(
-        select(User).where(
-            (User.username == user.username) | (User.email == user.email)
-        )
+    # Conflitos saem antes do Argon2: só cadastros novos pagam o hash
+    existing = await session.scalar(
+        select(User.username)
+        .where((User.username == user.username) | (User.email == user.email))
+        .order_by(User.username != user.username)
+        .limit(1)
     )
-    if db_user:
-        if db_user.username == user.username:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Username já existe',
-            )
-        elif db_user.email == user.email:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Email já existe',
-            )
+    if existing is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail=CONFLICT_DETAILS[
+                'users_username_key'
+                if existing == user.username
+                else 'users_email_key'
+            ],
+        )
 
     db_user = User(
         username=user.username,
         email=user.email,
-        password=get_password_hash(user.password),
+        password=await get_password_hash_async(user.password),
     )
     session.add(db_user)
-    await session.commit()
-    await session.refresh(db_user)
+    try:
+        await session.commit()
+    except IntegrityError as error:
+        await session.rollback()
+        detail = CONFLICT_DETAILS.get(
+            error.orig.diag.constraint_name, 'Username ou email já existe'
+        )
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=detail)
 
     return db_user
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
 async def read_users(
-    session: Session,
+    response: Response,
+    session: ReadSession,
     current_user: CurrentUser,
     filter_user: Annotated[FilterPage, Query()],
 ):
@@ -64,6 +84,10 @@ async def read_users(
     )
     users = query.all()
 
+    total = await count_rows(session, select(User.id), filter_user.count)
+    if total is not None:
+        response.headers['X-Total-Count'] = str(total)
+
     return {'users': users}
 
 
@@ -83,22 +107,35 @@ async def update_user(
             status_code=HTTPStatus.FORBIDDEN,
             detail='Permissão insuficiente',
         )
+    password = await get_password_hash_async(user.password)
     try:
-        current_user.username = user.username
-        current_user.email = user.email
-        current_user.password = get_password_hash(user.password)
-
-        session.add(current_user)
+        db_user = await session.scalar(
+            update(User)
+            .where(User.id == current_user.id)
+            .values(
+                username=user.username,
+                email=user.email,
+                password=password,
+            )
+            .returning(User)
+        )
         await session.commit()
-        await session.refresh(current_user)
-        return current_user
+        invalidate_principal(current_user.id)
 
     except IntegrityError:
+        await session.rollback()
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='Username ou email ja cadastrado',
         )
 
+    if not db_user:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Usuário não encontrado',
+        )
+    return db_user
+
 
 @router.delete(
     '/{user_id}',
@@ -115,16 +152,20 @@ async def delete_user(
             status_code=HTTPStatus.FORBIDDEN,
             detail='Não autorizado a deletar este usuário',
         )
-    await session.delete(current_user)
+    await session.execute(delete(Todo).where(Todo.user_id == current_user.id))
+    await session.execute(delete(User).where(User.id == current_user.id))
     await session.commit()
+    invalidate_principal(current_user.id)
     return Message(message='Usuário deletado com sucesso')
 
 
 @router.get('/{user_id}', status_code=HTTPStatus.OK, response_model=UserPublic)
 async def read_user(
     user_id: int,
-    session: Session,
+    response: Response,
+    session: ReadSession,
     current_user: CurrentUser,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     db_user = await session.scalar(select(User).where(User.id == user_id))
 
@@ -133,4 +174,12 @@ async def read_user(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Usuário não encontrado',
         )
+
+    etag = make_etag(db_user.id, db_user.updated_at.isoformat())
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+        )
+
+    response.headers['ETag'] = etag
     return db_user
@@ -1,14 +1,30 @@
 from datetime import datetime
+from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    field_validator,
+    model_validator,
+)
 
 from app_todo_list.models import TodoState
+from app_todo_list.pagination import CountMode, decode_cursor
 
 
 class Message(BaseModel):
     message: str
 
 
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+
 class EmpresaSchema(BaseModel):
     id: int
     razao_social: str
@@ -28,6 +44,13 @@ class UserPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    id: int
+    username: str
+    email: str
+    model_config = ConfigDict(frozen=True)
+
+
 class UserList(BaseModel):
     users: list[UserPublic]
 
@@ -40,14 +63,41 @@ class Token(BaseModel):
 class FilterPage(BaseModel):
     limit: int = Field(default=10, ge=1)
     offset: int = Field(default=0, ge=0)
+    count: CountMode = CountMode.none
 
 
-class FilterTodo(FilterPage):
+class FilterTodoFields(BaseModel):
     title: str | None = Field(default=None, min_length=3, max_length=20)
     description: str | None = None
     state: TodoState | None = None
 
 
+class FilterTodo(FilterPage, FilterTodoFields):
+    cursor: str | None = None
+
+    @field_validator('cursor')
+    @classmethod
+    def validate_cursor(cls, cursor: str | None) -> str | None:
+        if cursor is not None:
+            decode_cursor(cursor)
+        return cursor
+
+    @model_validator(mode='after')
+    def validate_cursor_or_offset(self):
+        if self.cursor and self.offset:
+            raise ValueError('Use cursor ou offset, não ambos')
+        return self
+
+
+class ExportFormat(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+class ExportTodo(FilterTodoFields):
+    format: ExportFormat = ExportFormat.ndjson
+
+
 class TodoSchema(BaseModel):
     title: str
     description: str
@@ -62,9 +112,72 @@ class TodoPublic(TodoSchema):
 
 class TodoList(BaseModel):
     todos: list[TodoPublic]
+    next_cursor: str | None = None
+
+
+class TodoStats(BaseModel):
+    counts: dict[TodoState, int]
+    total: int
 
 
 class TodoUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
     state: TodoState | None = None
+
+
+class TodoBulkUpdate(BaseModel):
+    ids: list[int] | None = Field(default=None, min_length=1)
+    from_state: TodoState | None = None
+    changes: TodoUpdate
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if self.ids is None and self.from_state is None:
+            raise ValueError('Informe ids ou from_state')
+        if not self.changes.model_fields_set:
+            raise ValueError('Informe ao menos um campo em changes')
+        return self
+
+
+class FilterTodoBulk(BaseModel):
+    ids: list[int] | None = Field(default=None, min_length=1)
+    state: TodoState | None = None
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if self.ids is None and self.state is None:
+            raise ValueError('Informe ids ou state')
+        return self
+
+
+class TodoBulkResult(BaseModel):
+    count: int
+    ids: list[int]
+
+
+class TodoImportBatch(BaseModel):
+    batch: int
+    rows: int
+
+
+class TodoImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class TodoImportResult(BaseModel):
+    imported: int
+    failed: int
+    batches: list[TodoImportBatch]
+    errors: list[TodoImportError]
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    size: int
+    created_at: datetime
+
+
+class ProfileList(BaseModel):
+    profiles: list[ProfileInfo]
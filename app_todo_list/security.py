@@ -1,21 +1,44 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import cache
 from http import HTTPStatus
+from time import perf_counter, time
 from zoneinfo import ZoneInfo
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
 from pwdlib import PasswordHash
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app_todo_list.cache import TTLCache
 from app_todo_list.database import get_session
+from app_todo_list.metrics import (
+    password_hash_duration,
+    password_hash_queue_wait,
+)
 from app_todo_list.models import User
-from app_todo_list.settings import Settings
+from app_todo_list.schemas import UserPrincipal
+from app_todo_list.settings import get_settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/token')
 pwd_context = PasswordHash.recommended()
-settings = Settings()
+settings = get_settings()
+logger = logging.getLogger(__name__)
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+password_hash_stats = {
+    'pending': 0,
+    'completed': 0,
+    'rejected': 0,
+    'queue_wait_seconds': 0.0,
+    'hash_seconds': 0.0,
+}
 
 
 def get_password_hash(password: str) -> str:
@@ -26,6 +49,68 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@cache
+def get_hash_executor():
+    if settings.PASSWORD_HASH_EXECUTOR == 'process':
+        return ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        thread_name_prefix='password-hash',
+    )
+
+
+def _timed_call(func, *args):
+    start = perf_counter()
+    result = func(*args)
+    return result, perf_counter() - start
+
+
+async def _run_in_hash_executor(func, *args):
+    if password_hash_stats['pending'] >= settings.PASSWORD_HASH_MAX_PENDING:
+        password_hash_stats['rejected'] += 1
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail='Servidor ocupado, tente novamente',
+            headers={'Retry-After': '1'},
+        )
+
+    password_hash_stats['pending'] += 1
+    start = perf_counter()
+    try:
+        result, hash_time = await asyncio.get_running_loop().run_in_executor(
+            get_hash_executor(), _timed_call, func, *args
+        )
+    finally:
+        password_hash_stats['pending'] -= 1
+
+    queue_wait = perf_counter() - start - hash_time
+    password_hash_stats['completed'] += 1
+    password_hash_stats['queue_wait_seconds'] += queue_wait
+    password_hash_stats['hash_seconds'] += hash_time
+    password_hash_queue_wait.observe(queue_wait, func.__name__)
+    password_hash_duration.observe(hash_time, func.__name__)
+    logger.debug(
+        '%s: queue_wait=%.4fs hash=%.4fs',
+        func.__name__,
+        queue_wait,
+        hash_time,
+    )
+
+    return result
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_executor(get_password_hash, password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    return await _run_in_hash_executor(
+        verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
@@ -39,7 +124,33 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
+async def warm_up():
+    decode(
+        create_access_token({'sub': '0'}),
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+    )
+
+    # Sobe todos os workers do executor e carrega o Argon2 em cada um
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                get_hash_executor(), get_password_hash, 'warm-up'
+            )
+            for _ in range(settings.PASSWORD_HASH_WORKERS)
+        )
+    )
+
+
+def shutdown_hash_executor():
+    if get_hash_executor.cache_info().currsize:
+        get_hash_executor().shutdown(wait=False, cancel_futures=True)
+        get_hash_executor.cache_clear()
+
+
 async def get_current_user(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     token: str = Depends(oauth2_scheme),
 ):
@@ -49,6 +160,10 @@ async def get_current_user(
         headers={'WWW-Authenticate': 'Bearer'},
     )
 
+    if settings.AUTH_CACHE_BY_TOKEN and (user := principal_cache.get(token)):
+        request.state.principal = user
+        return user
+
     try:
         payload = decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -63,11 +178,34 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = await session.scalar(
-        select(User).where(User.id == int(subject_email))
-    )
+    if settings.AUTH_CACHE_BY_TOKEN:
+        cache_key = token
+        cache_ttl = payload['exp'] - time() if 'exp' in payload else None
+    else:
+        cache_key, cache_ttl = int(subject_email), None
+        if user := principal_cache.get(cache_key):
+            request.state.principal = user
+            return user
+
+    user = (
+        await session.execute(
+            select(User.id, User.username, User.email).where(
+                User.id == int(subject_email)
+            )
+        )
+    ).first()
 
     if not user:
         raise credentials_exception
 
-    return user
+    principal = UserPrincipal(**user._mapping)
+    principal_cache.set(cache_key, principal, cache_ttl)
+    request.state.principal = principal
+
+    return principal
+
+
+def invalidate_principal(user_id: int):
+    principal_cache.pop(user_id)
+    if settings.AUTH_CACHE_BY_TOKEN:
+        principal_cache.discard_where(lambda user: user.id == user_id)
@@ -0,0 +1,124 @@
+import logging
+import math
+import os
+from importlib.util import find_spec
+from pathlib import Path
+
+import uvicorn
+
+from app_todo_list.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+CGROUP_CPU_MAX = Path('/sys/fs/cgroup/cpu.max')
+CGROUP_MEMORY_MAX = Path('/sys/fs/cgroup/memory.max')
+MEBIBYTE = 1024 * 1024
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    cpus = os.process_cpu_count() or 1
+    try:
+        quota, period = cpu_max.read_text(encoding='utf-8').split()
+    except OSError, ValueError:
+        return cpus
+    if quota == 'max':
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def memory_limit(memory_max: Path = CGROUP_MEMORY_MAX) -> int:
+    try:
+        limit = memory_max.read_text(encoding='utf-8').strip()
+    except OSError:
+        limit = 'max'
+    if limit != 'max':
+        return int(limit)
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+
+def pins_writers(settings: Settings) -> bool:
+    return bool(settings.READ_DATABASE_URL) and (
+        settings.READ_AFTER_WRITE_SECONDS > 0
+    )
+
+
+def worker_count(settings: Settings, cpus: int, memory: int) -> int:
+    if settings.SERVER_WORKERS:
+        workers = settings.SERVER_WORKERS
+    elif pins_writers(settings):
+        # As marcações de leitura das próprias escritas vivem no processo
+        workers = 1
+    else:
+        # Um worker assíncrono por CPU; a memória do contêiner dá o teto
+        by_memory = memory // (settings.SERVER_WORKER_MEMORY_MB * MEBIBYTE)
+        workers = min(cpus, by_memory)
+    # Cada worker precisa de ao menos uma conexão dentro do orçamento
+    return max(1, min(workers, settings.DB_CONNECTION_BUDGET))
+
+
+def pool_limits(settings: Settings, workers: int) -> tuple[int, int]:
+    per_worker = max(1, settings.DB_CONNECTION_BUDGET // workers)
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    max_overflow = min(settings.DB_MAX_OVERFLOW, per_worker - pool_size)
+    return pool_size, max_overflow
+
+
+def event_loop() -> str:
+    return 'uvloop' if find_spec('uvloop') else 'asyncio'
+
+
+def http_protocol() -> str:
+    return 'httptools' if find_spec('httptools') else 'h11'
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    cpus = available_cpus()
+    workers = worker_count(settings, cpus, memory_limit())
+    if workers > 1 and pins_writers(settings):
+        raise SystemExit(
+            'SERVER_WORKERS > 1 não garante a leitura das próprias escritas '
+            'com READ_DATABASE_URL; use um worker ou '
+            'READ_AFTER_WRITE_SECONDS=0'
+        )
+    pool_size, max_overflow = pool_limits(settings, workers)
+
+    # Os workers leem as configurações do ambiente ao importar a app
+    os.environ['DB_POOL_SIZE'] = str(pool_size)
+    os.environ['DB_MAX_OVERFLOW'] = str(max_overflow)
+    hash_workers = max(1, cpus // workers)
+    os.environ.setdefault('PASSWORD_HASH_WORKERS', str(hash_workers))
+    if workers > 1:
+        # Invalidar o cache de usuários só vale para o worker que apagou
+        os.environ['AUTH_CACHE_SIZE'] = '0'
+        os.environ['METRICS_WORKER_LABEL'] = 'true'
+    get_settings.cache_clear()
+
+    # Sem o supervisor, um único worker sairia de vez ao atingir o limite
+    max_requests = settings.SERVER_MAX_REQUESTS if workers > 1 else None
+    loop, http = event_loop(), http_protocol()
+    logger.info(
+        '%d workers (%s, %s), pool de %d + %d conexões por worker',
+        workers,
+        loop,
+        http,
+        pool_size,
+        max_overflow,
+    )
+    uvicorn.run(
+        'app_todo_list.app:app',
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        proxy_headers=True,
+    )
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -1,3 +1,6 @@
+from functools import cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,3 +13,55 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_TRANSACTION_POOLER: bool = False
+    DB_POOL_PREWARM: int = 0
+    DB_CONNECTION_BUDGET: int = 20
+
+    READ_DATABASE_URL: str | None = None
+    READ_AFTER_WRITE_SECONDS: float = 5
+    READ_AFTER_WRITE_CACHE_SIZE: int = 10_000
+    READ_REPLICA_MAX_LAG_SECONDS: float = 10
+    READ_REPLICA_CHECK_SECONDS: float = 5
+    READ_REPLICA_CHECK_TIMEOUT: float = 1
+
+    AUTH_CACHE_SIZE: int = 1024
+    AUTH_CACHE_TTL_SECONDS: float = 30
+    AUTH_CACHE_BY_TOKEN: bool = False
+
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    TODO_BULK_MAX_SIZE: int = 500
+    TODO_FAST_SERIALIZATION: bool = False
+    TODO_EXPORT_BATCH_SIZE: int = 1000
+    TODO_IMPORT_BATCH_SIZE: int = 5000
+    TODO_IMPORT_MAX_ERRORS: int = 100
+    TODO_IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+
+    METRICS_WORKER_LABEL: bool = False
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = '/tmp/app_todo_list-profiles'
+    PROFILING_MAX_FILES: int = 50
+
+    SERVER_HOST: str = '0.0.0.0'
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = None
+    SERVER_WORKER_MEMORY_MB: int = 160
+    SERVER_MAX_REQUESTS: int | None = None
+    SERVER_GRACEFUL_TIMEOUT: int = 20
+    SERVER_KEEPALIVE_TIMEOUT: int = 5
+
+
+@cache
+def get_settings() -> Settings:
+    return Settings()
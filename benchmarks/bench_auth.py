@@ -0,0 +1,75 @@
+"""Custo da autenticação conforme o número de tarefas do usuário cresce.
+
+Uso: python -m benchmarks.bench_auth
+"""
+
+import asyncio
+from http import HTTPStatus
+
+from sqlalchemy import event, insert
+
+from app_todo_list.models import Todo, TodoState, User
+from app_todo_list.security import create_access_token, get_password_hash
+from benchmarks.common import bench_client, bench_session, database_url, timed
+
+TODO_COUNTS = (0, 100, 1_000, 10_000)
+REPEAT = 200
+
+
+async def run(url):
+    async with bench_session(url) as session:
+        user = User(
+            username='bench',
+            email='bench@test.com',
+            password=get_password_hash('secret'),
+        )
+        session.add(user)
+        await session.commit()
+
+        token = create_access_token({'sub': str(user.id)})
+        headers = {'Authorization': f'Bearer {token}'}
+
+        statements = []
+        event.listen(
+            session.bind.sync_engine,
+            'before_cursor_execute',
+            lambda *args: statements.append(args[2]),
+        )
+
+        async with bench_client(session) as client:
+
+            async def refresh():
+                response = await client.post('/auth/refresh', headers=headers)
+                assert response.status_code == HTTPStatus.OK
+
+            seeded = 0
+            for todo_count in TODO_COUNTS:
+                if todo_count > seeded:
+                    await session.execute(
+                        insert(Todo),
+                        [
+                            {
+                                'title': f'todo {i}',
+                                'description': 'bench',
+                                'state': TodoState.todo,
+                                'user_id': user.id,
+                            }
+                            for i in range(seeded, todo_count)
+                        ],
+                    )
+                    await session.commit()
+                    seeded = todo_count
+
+                statements.clear()
+                result = await timed(refresh, REPEAT)
+                result['statements_per_request'] = len(statements) / REPEAT
+                print(f'todos={todo_count:>6} {result}')
+
+
+def main():
+    with database_url() as url:
+        asyncio.run(run(url))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Serialização de TodoList: caminho padrão do FastAPI x dump_todo_list.
+
+Uso: python -m benchmarks.bench_serialization
+"""
+
+import json
+import timeit
+from collections import namedtuple
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from app_todo_list.models import Todo, TodoState
+from app_todo_list.routers.todos import TODO_PUBLIC_COLUMNS, dump_todo_list
+from app_todo_list.schemas import TodoList
+
+SIZES = (10, 1_000, 10_000)
+TodoRow = namedtuple('TodoRow', [column.key for column in TODO_PUBLIC_COLUMNS])
+todo_list_adapter = TypeAdapter(TodoList)
+
+
+def make_todos(size):
+    now = datetime.now()
+    todos = []
+    for i in range(size):
+        todo = Todo(
+            title=f'todo {i}',
+            description='descrição da tarefa',
+            state=TodoState.todo,
+            user_id=1,
+        )
+        todo.id, todo.created_at, todo.updated_at = i, now, now
+        todos.append(todo)
+    return todos
+
+
+def default_path(todos):
+    # Mesmo fluxo de serialize_response + JSONResponse.render do FastAPI
+    value = todo_list_adapter.validate_python(
+        {'todos': todos, 'next_cursor': None}, from_attributes=True
+    )
+    content = todo_list_adapter.dump_python(value, mode='json')
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+    ).encode()
+
+
+def fast_path(rows):
+    return dump_todo_list(rows, None)
+
+
+def main():
+    for size in SIZES:
+        todos = make_todos(size)
+        rows = [
+            TodoRow(*(getattr(todo, c.key) for c in TODO_PUBLIC_COLUMNS))
+            for todo in todos
+        ]
+        assert json.loads(default_path(todos)) == json.loads(fast_path(rows))
+
+        number = max(1, 20_000 // size)
+        default = min(
+            timeit.repeat(lambda: default_path(todos), number=number, repeat=5)
+        )
+        fast = min(
+            timeit.repeat(lambda: fast_path(rows), number=number, repeat=5)
+        )
+        print(
+            f'rows={size:>6} '
+            f'padrão={default / number * 1000:.3f}ms '
+            f'rápido={fast / number * 1000:.3f}ms '
+            f'({default / fast:.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Tempo de cold start: do exec do processo à primeira resposta 200.
+
+Uso: python -m benchmarks.bench_startup [--runs 10] [--path /] [--workers N]
+
+Sobe o servidor pelo mesmo ponto de entrada da imagem,
+`python -m app_todo_list.serve`.
+
+Mede também só o import de app_todo_list.app, para separar o custo dos
+imports do custo de subir o servidor.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+
+import httpx
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(path, workers=None, timeout=30):
+    port = free_port()
+    env = {**os.environ, 'SERVER_HOST': '127.0.0.1', 'SERVER_PORT': str(port)}
+    if workers:
+        env['SERVER_WORKERS'] = str(workers)
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'app_todo_list.serve'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError('o servidor encerrou antes de responder')
+            try:
+                response = httpx.get(f'http://127.0.0.1:{port}{path}')
+                if response.status_code == HTTPStatus.OK:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.005)
+        raise RuntimeError('o servidor não respondeu a tempo')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def time_to_import():
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', 'import app_todo_list.app'], check=True
+    )
+    return time.perf_counter() - start
+
+
+def summarize(timings):
+    timings = [timing * 1000 for timing in timings]
+    return {
+        'median_ms': round(statistics.median(timings), 1),
+        'p95_ms': round(
+            statistics.quantiles(timings, n=20, method='inclusive')[-1], 1
+        ),
+        'max_ms': round(max(timings), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    imports = [time_to_import() for _ in range(args.runs)]
+    print(f'import app_todo_list.app {summarize(imports)}')
+
+    startups = [
+        time_to_first_response(args.path, args.workers)
+        for _ in range(args.runs)
+    ]
+    print(f'exec -> primeira resposta {summarize(startups)}')
+
+
+if __name__ == '__main__':
+    main()
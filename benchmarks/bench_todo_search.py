@@ -0,0 +1,95 @@
+"""Latência dos filtros de title/description com e sem os índices trigram.
+
+Uso: python -m benchmarks.bench_todo_search [--rows 2000000]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select, text
+
+from app_todo_list.models import Todo
+from app_todo_list.routers.todos import filter_todos
+from app_todo_list.schemas import FilterTodo
+from benchmarks.common import bench_session, database_url, timed
+
+TRIGRAM_INDEXES = ('ix_todos_title_trgm', 'ix_todos_description_trgm')
+FILTERS = {
+    'title': FilterTodo(title='a1b2c'),
+    'description': FilterTodo(description='3d4e5'),
+    'title+state': FilterTodo(title='a1b2c', state='todo'),
+}
+REPEAT = 20
+
+
+async def seed(session, rows):
+    await session.execute(
+        text(
+            'INSERT INTO users (username, email, password) '
+            "VALUES ('bench', 'bench@test.com', 'x')"
+        )
+    )
+    await session.execute(
+        text(
+            'INSERT INTO todos (title, description, state, user_id) '
+            "SELECT 'todo ' || md5(i::text), md5(md5(i::text)), "
+            "(ARRAY['draft', 'todo', 'doing', 'done', 'trash'])"
+            '[1 + i % 5]::todostate, 1 '
+            'FROM generate_series(1, :rows) AS i'
+        ),
+        {'rows': rows},
+    )
+    await session.commit()
+
+
+async def measure(session, label):
+    await session.execute(text('ANALYZE todos'))
+    for name, todo_filter in FILTERS.items():
+        query = (
+            filter_todos(select(Todo), 1, todo_filter)
+            .order_by(Todo.created_at, Todo.id)
+            .limit(todo_filter.limit + 1)
+        )
+
+        async def run_query(query=query):
+            (await session.scalars(query)).all()
+
+        print(f'{label:<10} {name:<12} {await timed(run_query, REPEAT)}')
+
+
+async def run(url, rows):
+    async with bench_session(url) as session:
+        for index in TRIGRAM_INDEXES:
+            await session.execute(text(f'DROP INDEX {index}'))
+        await seed(session, rows)
+
+        await measure(session, 'sem índice')
+
+        await session.execute(
+            text(
+                'CREATE INDEX ix_todos_title_trgm ON todos '
+                'USING gin (title gin_trgm_ops)'
+            )
+        )
+        await session.execute(
+            text(
+                'CREATE INDEX ix_todos_description_trgm ON todos '
+                'USING gin (description gin_trgm_ops)'
+            )
+        )
+        await session.commit()
+
+        await measure(session, 'com índice')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    with database_url() as url:
+        asyncio.run(run(url, args.rows))
+
+
+if __name__ == '__main__':
+    main()
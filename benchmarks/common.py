@@ -0,0 +1,62 @@
+import os
+import statistics
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app_todo_list.app import app
+from app_todo_list.database import get_session
+from app_todo_list.models import table_registry
+
+
+@contextmanager
+def database_url():
+    url = os.environ.get('BENCH_DATABASE_URL')
+    if url:
+        yield url
+        return
+
+    from testcontainers.postgres import PostgresContainer  # noqa: PLC0415
+
+    with PostgresContainer('postgres:17', driver='psycopg') as postgres:
+        yield postgres.get_connection_url()
+
+
+@asynccontextmanager
+async def bench_session(url):
+    engine = create_async_engine(url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def bench_client(session):
+    app.dependency_overrides[get_session] = lambda: session
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url='http://bench') as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+async def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(statistics.quantiles(timings, n=20)[-1], 3),
+    }
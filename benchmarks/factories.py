@@ -0,0 +1,33 @@
+from functools import cache
+
+import factory
+import factory.fuzzy
+
+from app_todo_list.models import Todo, TodoState, User
+from app_todo_list.security import get_password_hash
+
+PASSWORD = 'secret'
+
+
+@cache
+def password_hash():
+    return get_password_hash(PASSWORD)
+
+
+class UserFactory(factory.Factory):
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f'bench_{n}')
+    email = factory.LazyAttribute(lambda obj: f'{obj.username}@bench.com')
+    password = factory.LazyFunction(password_hash)
+
+
+class TodoFactory(factory.Factory):
+    class Meta:
+        model = Todo
+
+    title = factory.Faker('sentence', nb_words=3)
+    description = factory.Faker('text', max_nb_chars=120)
+    state = factory.fuzzy.FuzzyChoice(TodoState)
+    user_id = 1
@@ -0,0 +1,326 @@
+"""Gerador de carga: RPS e p50/p95/p99 por rota de auth, users e todos.
+
+Uso: python -m benchmarks.load [--target asgi|uvicorn] [--users 20]
+    [--todos 200] [--concurrency 32] [--duration 10] [--output FILE]
+
+Com --target asgi o app roda no mesmo processo via ASGITransport; com
+--target uvicorn um servidor local é iniciado apontando para o mesmo
+banco. O resultado é salvo em JSON (benchmarks/results/ por padrão) para
+comparar execuções.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient, TransportError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app_todo_list.app import app
+from app_todo_list.database import get_session
+from app_todo_list.models import TodoState, table_registry
+from app_todo_list.security import create_access_token
+from benchmarks.common import database_url
+from benchmarks.factories import PASSWORD, TodoFactory, UserFactory
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+async def seed(engine, users, todos, rng):
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        seeded = UserFactory.create_batch(users)
+        session.add_all(seeded)
+        await session.commit()
+
+        for user in seeded:
+            session.add_all(
+                TodoFactory.build_batch(
+                    rng.randint(0, 2 * todos), user_id=user.id
+                )
+            )
+        await session.commit()
+
+    return [
+        {
+            'id': user.id,
+            'email': user.email,
+            'headers': {
+                'Authorization': (
+                    f'Bearer {create_access_token({"sub": str(user.id)})}'
+                )
+            },
+        }
+        for user in seeded
+    ]
+
+
+def scenarios(rng):
+    def login(client, user):
+        return client.post(
+            '/auth/token',
+            data={'username': user['email'], 'password': PASSWORD},
+        )
+
+    def refresh(client, user):
+        return client.post('/auth/refresh', headers=user['headers'])
+
+    def read_users(client, user):
+        return client.get('/users/', headers=user['headers'])
+
+    def read_user(client, user):
+        return client.get(f'/users/{user["id"]}', headers=user['headers'])
+
+    def read_todos(client, user):
+        return client.get('/todos/?limit=20', headers=user['headers'])
+
+    def read_todos_by_state(client, user):
+        state = rng.choice(list(TodoState)).value
+        return client.get(f'/todos/?state={state}', headers=user['headers'])
+
+    def search_todos(client, user):
+        return client.get('/todos/?title=the', headers=user['headers'])
+
+    def read_todo_stats(client, user):
+        return client.get('/todos/stats', headers=user['headers'])
+
+    def create_todo(client, user):
+        return client.post(
+            '/todos/',
+            headers=user['headers'],
+            json={'title': 'carga', 'description': 'gerada', 'state': 'todo'},
+        )
+
+    # (nome, peso, requisição)
+    return [
+        ('POST /auth/token', 1, login),
+        ('POST /auth/refresh', 4, refresh),
+        ('GET /users/', 4, read_users),
+        ('GET /users/{user_id}', 8, read_user),
+        ('GET /todos/', 30, read_todos),
+        ('GET /todos/?state', 15, read_todos_by_state),
+        ('GET /todos/?title', 8, search_todos),
+        ('GET /todos/stats', 10, read_todo_stats),
+        ('POST /todos/', 10, create_todo),
+    ]
+
+
+async def worker(client, users, routes, deadline, rng):
+    names = [name for name, _, _ in routes]
+    weights = [weight for _, weight, _ in routes]
+    requests = {name: request for name, _, request in routes}
+    samples = []
+
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        response = await requests[name](client, rng.choice(users))
+        elapsed = time.perf_counter() - start
+        samples.append((
+            name,
+            elapsed,
+            response.status_code < HTTPStatus.BAD_REQUEST,
+        ))
+
+    return samples
+
+
+def percentiles(latencies):
+    if len(latencies) <= 1:
+        value = latencies[0] * 1000 if latencies else 0
+        return value, value, value
+
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def summarize(samples, elapsed):
+    routes = {}
+    for name, latency, ok in samples:
+        route = routes.setdefault(name, {'latencies': [], 'errors': 0})
+        route['latencies'].append(latency)
+        route['errors'] += not ok
+
+    summary = {}
+    for name, route in sorted(routes.items()):
+        p50, p95, p99 = percentiles(route['latencies'])
+        summary[name] = {
+            'requests': len(route['latencies']),
+            'errors': route['errors'],
+            'rps': round(len(route['latencies']) / elapsed, 1),
+            'p50_ms': round(p50, 3),
+            'p95_ms': round(p95, 3),
+            'p99_ms': round(p99, 3),
+        }
+
+    p50, p95, p99 = percentiles([latency for _, latency, _ in samples])
+    summary['total'] = {
+        'requests': len(samples),
+        'errors': sum(not ok for _, _, ok in samples),
+        'rps': round(len(samples) / elapsed, 1),
+        'p50_ms': round(p50, 3),
+        'p95_ms': round(p95, 3),
+        'p99_ms': round(p99, 3),
+    }
+    return summary
+
+
+@asynccontextmanager
+async def asgi_client(engine):
+    async def get_bench_session():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_bench_session
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url='http://bench') as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+async def wait_until_ready(client, server, attempts=100):
+    for _ in range(attempts):
+        if server.poll() is not None:
+            raise RuntimeError('uvicorn encerrou antes de aceitar conexões')
+        try:
+            await client.get('/')
+            return
+        except TransportError:
+            await asyncio.sleep(0.1)
+
+    raise RuntimeError('uvicorn não respondeu a tempo')
+
+
+@asynccontextmanager
+async def uvicorn_client(url):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'app_todo_list.app:app',
+            '--port',
+            str(port),
+            '--log-level',
+            'warning',
+        ],
+        env={**os.environ, 'DATABASE_URL': url},
+    )
+    base_url = f'http://127.0.0.1:{port}'
+
+    try:
+        async with AsyncClient(base_url=base_url) as client:
+            await wait_until_ready(client, server)
+            yield client
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except OSError, subprocess.CalledProcessError:
+        return None
+
+
+async def run(url, args):
+    rng = random.Random(args.seed)
+    engine = create_async_engine(url)
+    users = await seed(engine, args.users, args.todos, rng)
+    routes = scenarios(rng)
+
+    client_context = (
+        asgi_client(engine) if args.target == 'asgi' else uvicorn_client(url)
+    )
+    async with client_context as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        results = await asyncio.gather(
+            *(
+                worker(client, users, routes, deadline, rng)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    samples = [sample for samples in results for sample in samples]
+    await engine.dispose()
+
+    return {
+        'timestamp': datetime.now(tz=timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'params': vars(args),
+        'elapsed_seconds': round(elapsed, 3),
+        'routes': summarize(samples, elapsed),
+    }
+
+
+def report(result):
+    print(
+        f'{"rota":<24} {"reqs":>7} {"erros":>6} {"rps":>8} '
+        f'{"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}'
+    )
+    for name, route in result['routes'].items():
+        print(
+            f'{name:<24} {route["requests"]:>7} {route["errors"]:>6} '
+            f'{route["rps"]:>8} {route["p50_ms"]:>9} '
+            f'{route["p95_ms"]:>9} {route["p99_ms"]:>9}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--target', choices=('asgi', 'uvicorn'), default='asgi'
+    )
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--todos', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    with database_url() as url:
+        result = asyncio.run(run(url, args))
+
+    report(result)
+
+    output = args.output or RESULTS_DIR / (
+        f'load-{result["timestamp"][:19].replace(":", "")}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    result['params']['output'] = str(output)
+    output.write_text(json.dumps(result, indent=2))
+    print(f'resultado salvo em {output}')
+
+
+if __name__ == '__main__':
+    main()
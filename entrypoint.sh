@@ -1,7 +1,11 @@
 #!/bin/sh
+set -e
 
-# Executa as migrações do banco de dados
-poetry run alembic upgrade head
+# No Fly as migrações rodam uma vez por deploy (release_command);
+# defina RUN_MIGRATIONS=1 para rodá-las aqui, como no compose
+if [ "${RUN_MIGRATIONS:-0}" = "1" ]; then
+    alembic upgrade head
+fi
 
-# Inicia a aplicação
-poetry run uvicorn --host 0.0.0.0 --port 8000 app_todo_list.app:app
\ No newline at end of file
+# exec: o servidor vira o PID 1 e recebe os sinais de parada direto
+exec "$@"
\ No newline at end of file
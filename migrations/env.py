@@ -7,13 +7,13 @@ from sqlalchemy import pool
 
 from alembic import context
 
-from app_todo_list.settings import Settings
+from app_todo_list.settings import get_settings
 from app_todo_list.models import table_registry
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-settings = Settings()
+settings = get_settings()
 config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
 
 # Interpret the config file for Python logging.
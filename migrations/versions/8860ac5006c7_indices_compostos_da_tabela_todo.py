@@ -0,0 +1,33 @@
+"""indices compostos da tabela todo
+
+Revision ID: 8860ac5006c7
+Revises: 97e5ce52e1a2
+Create Date: 2026-10-18 10:03:17.220941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8860ac5006c7'
+down_revision: Union[str, Sequence[str], None] = '97e5ce52e1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.create_index('ix_todos_user_id_created_at_id', 'todos', ['user_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_user_id_state_created_at_id', 'todos', ['user_id', 'state', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_todos_user_id_state_created_at_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_user_id_created_at_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
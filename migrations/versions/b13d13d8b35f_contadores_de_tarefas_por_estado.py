@@ -0,0 +1,102 @@
+"""contadores de tarefas por estado
+
+Revision ID: b13d13d8b35f
+Revises: 8860ac5006c7
+Create Date: 2026-10-18 14:21:09.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b13d13d8b35f'
+down_revision: Union[str, Sequence[str], None] = '8860ac5006c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TODO_STATE_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_state_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_state_counts AS counts (user_id, state, count)
+        SELECT user_id, state, count(*) FROM new_rows
+        GROUP BY user_id, state
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = counts.count + excluded.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO todo_state_counts AS counts (user_id, state, count)
+        SELECT user_id, state, -count(*) FROM old_rows
+        GROUP BY user_id, state
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = counts.count + excluded.count;
+    ELSE
+        INSERT INTO todo_state_counts AS counts (user_id, state, count)
+        SELECT user_id, state, sum(delta) FROM (
+            SELECT user_id, state, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT user_id, state, -1 AS delta FROM old_rows
+        ) AS changes
+        GROUP BY user_id, state
+        HAVING sum(delta) <> 0
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = counts.count + excluded.count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TODO_STATE_COUNTS_TRIGGERS = (
+    """
+    CREATE TRIGGER todos_state_counts_insert AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todo_state_counts_apply()
+    """,
+    """
+    CREATE TRIGGER todos_state_counts_update AFTER UPDATE ON todos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todo_state_counts_apply()
+    """,
+    """
+    CREATE TRIGGER todos_state_counts_delete AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todo_state_counts_apply()
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('todo_state_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('state', postgresql.ENUM('draft', 'todo', 'doing', 'done', 'trash', name='todostate', create_type=False), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'state')
+    )
+    op.execute(TODO_STATE_COUNTS_FUNCTION)
+    # CREATE TRIGGER bloqueia escritas em todos até o fim da migração,
+    # então o backfill abaixo enxerga um estado consistente
+    for trigger in TODO_STATE_COUNTS_TRIGGERS:
+        op.execute(trigger)
+    op.execute(
+        'INSERT INTO todo_state_counts (user_id, state, count) '
+        'SELECT user_id, state, count(*) FROM todos GROUP BY user_id, state'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS todos_state_counts_delete ON todos')
+    op.execute('DROP TRIGGER IF EXISTS todos_state_counts_update ON todos')
+    op.execute('DROP TRIGGER IF EXISTS todos_state_counts_insert ON todos')
+    op.execute('DROP FUNCTION IF EXISTS todo_state_counts_apply()')
+    op.drop_table('todo_state_counts')
@@ -1,7 +1,7 @@
 from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 
-import factory
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
@@ -9,19 +9,48 @@ from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from testcontainers.postgres import PostgresContainer
 
+from app_todo_list import lifespan
 from app_todo_list.app import app
 from app_todo_list.database import get_session
-from app_todo_list.models import User, table_registry
-from app_todo_list.security import get_password_hash
+from app_todo_list.models import table_registry
+from app_todo_list.security import get_password_hash, principal_cache
 from app_todo_list.settings import Settings
+from tests.factories import UserFactory
+
+
+class QueryBudgetClient(TestClient):
+    def __init__(self, app, *, budget, engine):
+        super().__init__(app)
+        self.budget = budget
+        self.engine = engine
+
+    def request(self, *args, **kwargs):
+        # Orçamento do caminho frio: o usuário sempre sai do banco
+        principal_cache.clear()
+        with _query_budget(self.budget, engine=self.engine):
+            return super().request(*args, **kwargs)
+
+
+async def skip_warm_up(app):
+    app.state.ready = True
 
 
 @pytest.fixture
-def client(session):
+def client(request, monkeypatch, session, engine):
     def get_session_override():
         return session
 
-    with TestClient(app) as client:
+    principal_cache.clear()
+    if not request.node.get_closest_marker('warm_up'):
+        monkeypatch.setattr(lifespan, 'warm_up_app', skip_warm_up)
+
+    client_class = TestClient
+    if marker := request.node.get_closest_marker('query_budget'):
+        client_class = partial(
+            QueryBudgetClient, budget=marker.args[0], engine=engine
+        )
+
+    with client_class(app) as client:
         app.dependency_overrides[get_session] = get_session_override
         yield client
 
@@ -68,6 +97,41 @@ def mock_db_time():
     return _mock_db_time
 
 
+@contextmanager
+def _count_queries(*, engine):
+    statements = []
+
+    def count_hook(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_hook)
+
+    yield statements
+
+    event.remove(engine.sync_engine, 'before_cursor_execute', count_hook)
+
+
+@pytest.fixture
+def count_queries(engine):
+    return partial(_count_queries, engine=engine)
+
+
+@contextmanager
+def _query_budget(budget, *, engine):
+    with _count_queries(engine=engine) as statements:
+        yield statements
+
+    assert len(statements) <= budget, (
+        f'{len(statements)} comandos SQL para um orçamento de {budget}:\n'
+        + '\n'.join(statements)
+    )
+
+
+@pytest.fixture
+def query_budget(engine):
+    return partial(_query_budget, engine=engine)
+
+
 @pytest_asyncio.fixture
 async def user(session: AsyncSession):
     password = 'secret'
@@ -110,12 +174,3 @@ def token(client, user):
 @pytest.fixture
 def settings():
     return Settings()
-
-
-class UserFactory(factory.Factory):
-    class Meta:
-        model = User
-
-    username = factory.Sequence(lambda n: f'test_{n}')
-    email = factory.LazyAttribute(lambda obj: f'{obj.username}@test.com')
-    password = factory.LazyAttribute(lambda obj: f'senha_{obj.username}')
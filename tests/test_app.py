@@ -1,5 +1,9 @@
 from http import HTTPStatus
 
+from app_todo_list import database, security
+from app_todo_list.routers import todos
+from app_todo_list.settings import get_settings
+
 
 def test_root_return_ola_mundo(client):
     response = client.get('/')
@@ -22,3 +26,8 @@ def test_return_ola_mundo_html(client):
     </html>
     """
     )
+
+
+def test_settings_are_shared():
+    assert todos.settings is security.settings is database.setting
+    assert todos.settings is get_settings()
@@ -1,8 +1,10 @@
 from http import HTTPStatus
 
+import pytest
 from freezegun import freeze_time
 
 
+@pytest.mark.query_budget(1)
 def test_get_token(client, user):
     login = {
         'username': user.email,
@@ -16,6 +18,7 @@ def test_get_token(client, user):
     assert 'access_token' in token
 
 
+@pytest.mark.query_budget(1)
 def test_get_token_invalid_credentials(client):
     login = {
         'username': 'test',
@@ -27,6 +30,7 @@ def test_get_token_invalid_credentials(client):
     assert response.json() == {'detail': 'Usuário ou senha incorretos'}
 
 
+@pytest.mark.query_budget(1)
 def test_get_token_invalid_password(client, user):
     login = {
         'username': user.email,
@@ -38,6 +42,7 @@ def test_get_token_invalid_password(client, user):
     assert response.json() == {'detail': 'Usuário ou senha incorretos'}
 
 
+@pytest.mark.query_budget(1)
 def test_token_expired_after_time(client, user):
     with freeze_time('2026-01-01 12:00:00'):
         response = client.post(
@@ -63,6 +68,7 @@ def test_token_expired_after_time(client, user):
         }
 
 
+@pytest.mark.query_budget(1)
 def test_refresh_token(client, token):
     response = client.post(
         '/auth/refresh',
@@ -77,6 +83,7 @@ def test_refresh_token(client, token):
     assert data['token_type'] == 'Bearer'
 
 
+@pytest.mark.query_budget(1)
 def test_token_expired_dont_refresh(client, user):
     with freeze_time('2026-01-01 12:00:00'):
         response = client.post(
@@ -0,0 +1,65 @@
+from app_todo_list.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    cache.set('a', 'value')
+
+    assert cache.get('a') == 'value'
+    assert cache.get('b') is None
+    assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+
+def test_cache_expires_entries():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set('a', 'value')
+    cache.set('b', 'short lived', ttl=5)
+
+    timer.now = 6
+
+    assert cache.get('a') == 'value'
+    assert cache.get('b') is None
+    assert cache.evictions == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set('a', 'first')
+    cache.set('b', 'second')
+    cache.get('a')
+
+    cache.set('c', 'third')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'first'
+    assert cache.get('c') == 'third'
+    assert cache.evictions == 1
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = TTLCache(maxsize=2, ttl=0)
+
+    cache.set('a', 'value')
+
+    assert len(cache) == 0
+
+
+def test_cache_discard_where():
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set('a', 'discard')
+    cache.set('b', 'keep')
+
+    cache.discard_where(lambda value: value == 'discard')
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 'keep'
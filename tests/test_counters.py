@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import delete, update
+
+from app_todo_list.counters import (
+    rebuild_todo_state_counts,
+    todo_state_counts,
+)
+from app_todo_list.models import Todo, TodoState, TodoStateCount
+
+
+def make_todo(user_id, state):
+    return Todo(title='t', description='d', state=state, user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_writes(session, user, other_user):
+    session.add_all([
+        make_todo(user.id, TodoState.todo),
+        make_todo(user.id, TodoState.todo),
+        make_todo(user.id, TodoState.done),
+        make_todo(other_user.id, TodoState.todo),
+    ])
+    await session.commit()
+
+    await session.execute(
+        update(Todo)
+        .where(Todo.user_id == user.id, Todo.state == TodoState.todo)
+        .values(state=TodoState.doing)
+    )
+    await session.execute(
+        delete(Todo).where(
+            Todo.user_id == user.id, Todo.state == TodoState.done
+        )
+    )
+    await session.commit()
+
+    counts = await todo_state_counts(session, user.id)
+    expected_doing = 2
+    assert counts[TodoState.doing] == expected_doing
+    assert counts[TodoState.todo] == 0
+    assert counts[TodoState.done] == 0
+    assert counts == await todo_state_counts(session, user.id, live=True)
+    assert (await todo_state_counts(session, other_user.id))[
+        TodoState.todo
+    ] == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drifted_counters(session, user, other_user):
+    session.add_all([
+        make_todo(user.id, TodoState.draft),
+        make_todo(other_user.id, TodoState.trash),
+    ])
+    await session.commit()
+    await session.execute(update(TodoStateCount).values(count=42))
+    await session.commit()
+
+    rows = await rebuild_todo_state_counts(session, user.id)
+
+    expected_rows = 1
+    expected_drifted = 42
+    assert rows == expected_rows
+    assert (await todo_state_counts(session, user.id))[TodoState.draft] == 1
+    other_counts = await todo_state_counts(session, other_user.id)
+    assert other_counts[TodoState.trash] == expected_drifted
+
+    await rebuild_todo_state_counts(session)
+
+    other_counts = await todo_state_counts(session, other_user.id)
+    assert other_counts[TodoState.trash] == 1
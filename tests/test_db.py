@@ -3,6 +3,7 @@ from datetime import datetime
 
 import pytest
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from app_todo_list.models import User
 
@@ -18,7 +19,9 @@ async def test_create_user(session, mock_db_time):
         await session.commit()
 
         user = await session.scalar(
-            select(User).where(User.username == 'test')
+            select(User)
+            .options(selectinload(User.todos))
+            .where(User.username == 'test')
         )
 
     assert asdict(user) == {
@@ -30,3 +33,14 @@ async def test_create_user(session, mock_db_time):
         'updated_at': time,
         'todos': [],
     }
+
+
+@pytest.mark.asyncio
+async def test_query_budget_fails_when_exceeded(session, query_budget):
+    async def two_statements():
+        with query_budget(1):
+            await session.execute(select(1))
+            await session.execute(select(2))
+
+    with pytest.raises(AssertionError, match='2 comandos SQL'):
+        await two_statements()
@@ -0,0 +1,152 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app_todo_list import lifespan
+from app_todo_list.app import app
+from app_todo_list.database import (
+    create_engine_from_settings,
+    pool_stats,
+    prewarm_pool,
+)
+from app_todo_list.security import get_hash_executor
+
+
+def test_read_pool_stats(client, settings):
+    response = client.get('/health/pool')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['size'] == settings.DB_POOL_SIZE
+    assert set(response.json()) == {
+        'size',
+        'checked_in',
+        'checked_out',
+        'overflow',
+    }
+
+
+@pytest.mark.asyncio
+async def test_engine_uses_pool_settings(engine, settings):
+    settings.DB_POOL_SIZE = 3
+    settings.DB_MAX_OVERFLOW = 1
+    url = engine.url.render_as_string(hide_password=False)
+    pooled_engine = create_engine_from_settings(url, settings)
+
+    async with pooled_engine.connect():
+        stats = pool_stats(pooled_engine)
+
+    await pooled_engine.dispose()
+
+    assert stats['size'] == settings.DB_POOL_SIZE
+    assert stats['checked_out'] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_transaction_pooler_disables_prepare(engine, settings):
+    settings.DB_TRANSACTION_POOLER = True
+    url = engine.url.render_as_string(hide_password=False)
+    pooled_engine = create_engine_from_settings(url, settings)
+
+    async with pooled_engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        prepare_threshold = raw_connection.driver_connection.prepare_threshold
+
+    await pooled_engine.dispose()
+
+    assert prepare_threshold is None
+
+
+def wait_until_ready(client):
+    deadline = time.monotonic() + 10
+    response = client.get('/health/ready')
+    while (
+        response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        and time.monotonic() < deadline
+    ):
+        time.sleep(0.05)
+        response = client.get('/health/ready')
+    return response
+
+
+@pytest.mark.warm_up
+def test_read_readiness_after_warm_up(client):
+    response = wait_until_ready(client)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Pronto'}
+
+
+def test_read_readiness_while_warming(monkeypatch):
+    async def still_warming(app):
+        pass
+
+    monkeypatch.setattr(lifespan, 'warm_up_app', still_warming)
+    with TestClient(app) as client:
+        response = client.get('/health/ready')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_read_readiness_when_warm_up_fails(monkeypatch, caplog):
+    async def broken_warm_up():
+        raise RuntimeError
+
+    monkeypatch.setattr(lifespan, 'warm_up', broken_warm_up)
+    with TestClient(app) as client:
+        response = wait_until_ready(client)
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'Falha ao aquecer os hashers de senha' in caplog.text
+
+
+def test_lifespan_shuts_down_hash_executor():
+    with TestClient(app):
+        executor = get_hash_executor()
+
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+    assert get_hash_executor() is not executor
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pool_opens_connections(engine, settings):
+    settings.DB_POOL_SIZE = 3
+    url = engine.url.render_as_string(hide_password=False)
+    pooled_engine = create_engine_from_settings(url, settings)
+
+    opened = await prewarm_pool(5, pooled_engine)
+    stats = pool_stats(pooled_engine)
+
+    await pooled_engine.dispose()
+
+    assert opened == settings.DB_POOL_SIZE
+    assert stats['checked_in'] == settings.DB_POOL_SIZE
+    assert stats['checked_out'] == 0
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pool_closes_connections_on_failure(engine, settings):
+    settings.DB_POOL_SIZE = 3
+    url = engine.url.render_as_string(hide_password=False)
+    pooled_engine = create_engine_from_settings(url, settings)
+    attempts = []
+    failing_attempt = 2
+
+    @event.listens_for(pooled_engine.sync_engine, 'do_connect')
+    def fail_second_connect(dialect, conn_rec, cargs, cparams):
+        attempts.append(conn_rec)
+        if len(attempts) == failing_attempt:
+            raise ConnectionRefusedError
+
+    with pytest.raises(ConnectionRefusedError):
+        await prewarm_pool(3, pooled_engine)
+    stats = pool_stats(pooled_engine)
+
+    await pooled_engine.dispose()
+
+    assert stats['checked_out'] == 0
+    assert stats['checked_in'] == settings.DB_POOL_SIZE - 1
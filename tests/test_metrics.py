@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+from app_todo_list.metrics import CallbackMetric, Histogram, registry, render
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram('latency_seconds', 'Latência.', ('route',), (1, 5))
+    registry.remove(histogram)
+
+    histogram.observe(0.5, '/a')
+    histogram.observe(3, '/a')
+    histogram.observe(7, '/a')
+
+    assert render([histogram]).splitlines() == [
+        '# HELP latency_seconds Latência.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{route="/a",le="1.0"} 1',
+        'latency_seconds_bucket{route="/a",le="5.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 10.5',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_callback_metric_escapes_labels():
+    metric = CallbackMetric(
+        'items', 'Itens.', 'gauge', ('name',), lambda: [(('a"b\n',), 2)]
+    )
+    registry.remove(metric)
+
+    assert render([metric]).splitlines()[-1] == r'items{name="a\"b\n"} 2'
+
+
+def test_render_adds_const_labels():
+    metric = CallbackMetric(
+        'items', 'Itens.', 'gauge', ('name',), lambda: [(('a',), 2)]
+    )
+    registry.remove(metric)
+
+    lines = render([metric], const_labels={'worker': 42}).splitlines()
+
+    assert lines[-1] == 'items{worker="42",name="a"} 2'
+
+
+def test_read_metrics(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)
+    client.get('/todos/', headers=headers)
+
+    response = client.get('/metrics')
+    lines = response.text.splitlines()
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert any(
+        line.startswith(
+            'http_request_duration_seconds_count'
+            '{method="GET",route="/todos/",status="200"}'
+        )
+        for line in lines
+    )
+    assert any(
+        line.startswith(
+            'http_request_db_statements_count{method="GET",route="/todos/"}'
+        )
+        for line in lines
+    )
+    assert any(
+        line.startswith('db_statement_duration_seconds_count')
+        and 'statement="SELECT"' in line
+        for line in lines
+    )
+    assert any(
+        line.startswith('password_hash_duration_seconds_count')
+        and 'operation="verify_password"' in line
+        for line in lines
+    )
+    assert 'db_pool_checked_out{pool="primary"} 0' in lines
+    assert any(
+        line.startswith('auth_principal_cache_hits_total') for line in lines
+    )
@@ -0,0 +1,111 @@
+import os
+from http import HTTPStatus
+
+import pytest
+
+from app_todo_list import profiling
+
+PROFILE_TOKEN = 'token-de-profiling'
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling.settings, 'PROFILING_ENABLED', True)
+    monkeypatch.setattr(profiling.settings, 'PROFILING_TOKEN', PROFILE_TOKEN)
+    monkeypatch.setattr(profiling.settings, 'PROFILING_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_profiling_disabled_by_default(client, token):
+    response = client.get(
+        '/todos/',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'X-Profile-Token': PROFILE_TOKEN,
+        },
+    )
+
+    assert 'X-Profile-Id' not in response.headers
+    assert client.get('/profiles/').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_profile_request_with_token(client, token, profiling_enabled):
+    response = client.get(
+        '/todos/',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'X-Profile-Token': PROFILE_TOKEN,
+        },
+    )
+    profile_id = response.headers['X-Profile-Id']
+
+    assert response.status_code == HTTPStatus.OK
+    assert (profiling_enabled / profile_id).is_file()
+
+    listing = client.get(
+        '/profiles/', headers={'X-Profile-Token': PROFILE_TOKEN}
+    )
+    assert [p['id'] for p in listing.json()['profiles']] == [profile_id]
+
+    text = client.get(
+        f'/profiles/{profile_id}?format=text',
+        headers={'X-Profile-Token': PROFILE_TOKEN},
+    )
+    assert text.status_code == HTTPStatus.OK
+    assert 'cumulative' in text.text
+
+    raw = client.get(
+        f'/profiles/{profile_id}', headers={'X-Profile-Token': PROFILE_TOKEN}
+    )
+    assert raw.headers['content-type'] == 'application/octet-stream'
+
+
+def test_profile_ignores_wrong_token(client, token, profiling_enabled):
+    response = client.get(
+        '/todos/',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'X-Profile-Token': 'errado',
+        },
+    )
+
+    assert 'X-Profile-Id' not in response.headers
+    assert list(profiling_enabled.iterdir()) == []
+    forbidden = client.get('/profiles/', headers={'X-Profile-Token': 'x'})
+    assert forbidden.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_profile_sampling_and_retention(
+    client, profiling_enabled, monkeypatch
+):
+    monkeypatch.setattr(profiling.settings, 'PROFILING_SAMPLE_RATE', 1.0)
+    monkeypatch.setattr(profiling.settings, 'PROFILING_MAX_FILES', 2)
+
+    ids = [client.get('/').headers['X-Profile-Id'] for _ in range(3)]
+
+    assert sorted(p.name for p in profiling_enabled.iterdir()) == sorted(
+        ids[1:]
+    )
+
+
+def test_prune_profiles_ignores_mtime(tmp_path):
+    scope = {'path': '/todos/', 'method': 'GET'}
+    ids = [profiling.new_profile_id(scope) for _ in range(3)]
+    for profile_id in ids:
+        path = tmp_path / profile_id
+        path.touch()
+        # Sistemas de arquivos com mtime grosso empatam os três
+        os.utime(path, ns=(0, 0))
+
+    profiling.prune_profiles(tmp_path, keep=2)
+
+    assert [p.name for p in profiling.list_profiles(tmp_path)] == ids[:0:-1]
+
+
+def test_read_profile_rejects_unknown_ids(client, profiling_enabled):
+    response = client.get(
+        '/profiles/..%2Fsettings.prof',
+        headers={'X-Profile-Token': PROFILE_TOKEN},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+from tests.factories import UserFactory
+
+TODOS_PER_USER = 1000
+
+
+def _index_names(plan):
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if 'Index Name' in node:
+            yield node['Index Name']
+        nodes.extend(node.get('Plans', []))
+
+
+async def _explain(engine, statement, parameters):
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f'EXPLAIN (FORMAT JSON) {statement}', parameters
+        )
+        plan = result.scalar()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+@pytest.mark.parametrize(
+    ('method', 'url', 'payload', 'index'),
+    [
+        ('get', '/todos/', None, 'ix_todos_user_id_created_at_id'),
+        (
+            'get',
+            '/todos/?state=done',
+            None,
+            'ix_todos_user_id_state_created_at_id',
+        ),
+        ('get', '/todos/?title=tarefa', None, 'ix_todos_title_trgm'),
+        (
+            'get',
+            '/todos/?description=tarefa&state=todo',
+            None,
+            'ix_todos_description_trgm',
+        ),
+        ('patch', '/todos/1', {'state': 'done'}, 'todos_pkey'),
+        ('delete', '/todos/1', None, 'todos_pkey'),
+    ],
+)
+@pytest.mark.asyncio
+async def test_todos_queries_use_indexes(  # noqa: PLR0913, PLR0917
+    client, session, engine, user, token, method, url, payload, index
+):
+    other_users = UserFactory.create_batch(9)
+    session.add_all(other_users)
+    await session.commit()
+    await session.execute(
+        text(
+            'INSERT INTO todos (title, description, state, user_id) '
+            "SELECT 'compra ' || n, 'lista ' || n, "
+            '(enum_range(NULL::todostate))[n % 5 + 1], users.id '
+            'FROM users, generate_series(1, :rows) AS n'
+        ),
+        {'rows': TODOS_PER_USER},
+    )
+    await session.commit()
+    # VACUUM esvazia a lista pendente do GIN, como o autovacuum faria
+    async with engine.connect() as conn:
+        autocommit = await conn.execution_options(isolation_level='AUTOCOMMIT')
+        await autocommit.exec_driver_sql('VACUUM ANALYZE todos')
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        if 'todos' in statement and not statement.startswith('INSERT'):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    kwargs = {'json': payload} if payload is not None else {}
+    client.request(
+        method, url, headers={'Authorization': f'Bearer {token}'}, **kwargs
+    )
+    event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+
+    assert captured
+    for statement, parameters in captured:
+        plan = await _explain(engine, statement, parameters)
+        assert index in set(_index_names(plan)), statement
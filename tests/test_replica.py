@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app_todo_list import replica
+from app_todo_list.replica import (
+    get_read_session,
+    recent_writers,
+    replica_available,
+    replica_health,
+)
+from app_todo_list.schemas import UserPrincipal
+
+
+@pytest.fixture(autouse=True)
+def clear_replica_state():
+    recent_writers.clear()
+    replica_health.clear()
+    yield
+    recent_writers.clear()
+    replica_health.clear()
+
+
+def principal(user):
+    return UserPrincipal(id=user.id, username=user.username, email=user.email)
+
+
+async def read_session_for(session, user):
+    dependency = get_read_session(session, principal(user))
+    read_session = await anext(dependency)
+    await dependency.aclose()
+    return read_session
+
+
+@pytest.mark.asyncio
+async def test_read_session_without_replica_uses_primary(session, user):
+    assert await read_session_for(session, user) is session
+
+
+@pytest.mark.asyncio
+async def test_read_session_uses_healthy_replica(
+    session, user, engine, monkeypatch
+):
+    monkeypatch.setattr(replica, 'read_engine', engine)
+
+    read_session = await read_session_for(session, user)
+
+    assert read_session is not session
+    assert read_session.bind is engine
+
+
+@pytest.mark.asyncio
+async def test_read_session_pins_recent_writer_to_primary(
+    session, user, engine, monkeypatch
+):
+    monkeypatch.setattr(replica, 'read_engine', engine)
+    recent_writers.set(user.id, True)
+
+    assert await read_session_for(session, user) is session
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(
+    session, user, monkeypatch
+):
+    broken = create_async_engine(
+        'postgresql+psycopg://postgres@/nenhum?host=/tmp/nao-existe'
+    )
+    monkeypatch.setattr(replica, 'read_engine', broken)
+
+    read_session = await read_session_for(session, user)
+
+    assert read_session is session
+    assert replica_health.get(broken.url) is False
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_is_unhealthy(engine, monkeypatch):
+    monkeypatch.setattr(replica.setting, 'READ_REPLICA_MAX_LAG_SECONDS', -1)
+
+    assert await replica_available(engine) is False
+
+
+def test_successful_write_pins_user(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get('/todos/', headers=headers)
+    assert recent_writers.get(user.id) is None
+
+    response = client.post('/todos/', headers=headers, json={'title': 'x'})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert recent_writers.get(user.id) is None
+
+    client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'x', 'description': 'y'},
+    )
+    assert recent_writers.get(user.id) is True
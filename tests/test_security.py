@@ -1,8 +1,17 @@
 from http import HTTPStatus
 
+import pytest
 from jwt import decode
 
-from app_todo_list.security import create_access_token
+from app_todo_list.models import Todo, TodoState
+from app_todo_list.security import (
+    create_access_token,
+    get_password_hash_async,
+    password_hash_stats,
+    principal_cache,
+    settings,
+    verify_password_async,
+)
 
 
 def test_jwt(settings):
@@ -56,3 +65,114 @@ def test_get_current_user_does_not_exists(client):
     assert response.json() == {
         'detail': 'Não foi possível validar as credenciais'
     }
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_does_not_load_todos(
+    client, session, user, token, count_queries
+):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    principal_cache.clear()
+    with count_queries() as without_todos:
+        client.post('/auth/refresh', headers=headers)
+
+    session.add_all(
+        Todo(
+            title=f'todo {i}',
+            description='description',
+            state=TodoState.todo,
+            user_id=user.id,
+        )
+        for i in range(50)
+    )
+    await session.commit()
+
+    principal_cache.clear()
+    with count_queries() as with_todos:
+        response = client.post('/auth/refresh', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(with_todos) == len(without_todos) == 1
+    assert 'todos' not in with_todos[0]
+
+
+@pytest.mark.asyncio
+async def test_password_hash_runs_in_executor():
+    completed = password_hash_stats['completed']
+
+    hashed = await get_password_hash_async('secret')
+
+    assert await verify_password_async('secret', hashed)
+    assert not await verify_password_async('invalid', hashed)
+    assert password_hash_stats['completed'] == completed + 3
+    assert password_hash_stats['pending'] == 0
+
+
+def test_password_hash_queue_full(client, user, monkeypatch):
+    monkeypatch.setattr(settings, 'PASSWORD_HASH_MAX_PENDING', 0)
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json() == {'detail': 'Servidor ocupado, tente novamente'}
+
+
+def test_get_current_user_cached_principal(client, token, count_queries):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh', headers=headers)
+    hits = principal_cache.hits
+
+    with count_queries() as statements:
+        response = client.post('/auth/refresh', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements == []
+    assert principal_cache.hits == hits + 1
+
+
+def test_get_current_user_cache_by_token(
+    client, token, count_queries, monkeypatch
+):
+    monkeypatch.setattr(settings, 'AUTH_CACHE_BY_TOKEN', True)
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh', headers=headers)
+
+    with count_queries() as statements:
+        response = client.post('/auth/refresh', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements == []
+    assert principal_cache.get(token) is not None
+
+
+def test_update_user_invalidates_cached_principal(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh', headers=headers)
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'bob',
+            'email': 'bob@example.com',
+            'password': 'secret',
+        },
+    )
+    assert principal_cache.get(user.id) is None
+
+    client.post('/auth/refresh', headers=headers)
+    assert principal_cache.get(user.id).username == 'bob'
+
+
+def test_delete_user_invalidates_cached_principal(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post('/auth/refresh', headers=headers)
+
+    client.delete(f'/users/{user.id}', headers=headers)
+    response = client.post('/auth/refresh', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,155 @@
+import os
+
+import pytest
+
+from app_todo_list import serve
+
+MEBIBYTE = 1024 * 1024
+
+
+def test_available_cpus_respects_cgroup_quota(tmp_path):
+    cpu_max = tmp_path / 'cpu.max'
+    cpu_max.write_text('150000 100000\n', encoding='utf-8')
+    expected_cpus = min(2, os.process_cpu_count())
+
+    assert serve.available_cpus(cpu_max) == expected_cpus
+
+
+def test_available_cpus_without_quota(tmp_path):
+    cpu_max = tmp_path / 'cpu.max'
+    cpu_max.write_text('max 100000\n', encoding='utf-8')
+
+    assert serve.available_cpus(cpu_max) == os.process_cpu_count()
+    assert serve.available_cpus(tmp_path / 'missing') == (
+        os.process_cpu_count()
+    )
+
+
+def test_memory_limit_reads_cgroup(tmp_path):
+    memory_max = tmp_path / 'memory.max'
+    memory_max.write_text(f'{512 * MEBIBYTE}\n', encoding='utf-8')
+    expected_limit = 512 * MEBIBYTE
+
+    assert serve.memory_limit(memory_max) == expected_limit
+    assert serve.memory_limit(tmp_path / 'missing') > 0
+
+
+def test_worker_count_is_bounded_by_memory(settings):
+    settings.SERVER_WORKERS = None
+    settings.SERVER_WORKER_MEMORY_MB = 160
+    expected_workers = 3
+
+    workers = serve.worker_count(settings, 8, 512 * MEBIBYTE)
+
+    assert workers == expected_workers
+
+
+def test_worker_count_is_bounded_by_connection_budget(settings):
+    settings.SERVER_WORKERS = 16
+    settings.DB_CONNECTION_BUDGET = 4
+    expected_workers = 4
+
+    workers = serve.worker_count(settings, 1, 64 * MEBIBYTE)
+
+    assert workers == expected_workers
+
+
+def test_pool_limits_fit_connection_budget(settings):
+    settings.DB_CONNECTION_BUDGET = 20
+    settings.DB_POOL_SIZE = 5
+    settings.DB_MAX_OVERFLOW = 10
+    workers = 4
+
+    pool_size, max_overflow = serve.pool_limits(settings, workers)
+
+    assert pool_size == settings.DB_POOL_SIZE
+    assert workers * (pool_size + max_overflow) <= (
+        settings.DB_CONNECTION_BUDGET
+    )
+
+
+def test_worker_count_keeps_one_worker_with_replica(settings):
+    settings.SERVER_WORKERS = None
+    settings.READ_DATABASE_URL = 'postgresql+psycopg://replica/app'
+    expected_workers = 1
+
+    workers = serve.worker_count(settings, 8, 8192 * MEBIBYTE)
+
+    assert workers == expected_workers
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        serve.uvicorn, 'run', lambda app, **kwargs: calls.append(kwargs)
+    )
+    for name in (
+        'SERVER_WORKERS',
+        'SERVER_MAX_REQUESTS',
+        'DB_CONNECTION_BUDGET',
+        'DB_POOL_SIZE',
+        'DB_MAX_OVERFLOW',
+        'PASSWORD_HASH_WORKERS',
+        'AUTH_CACHE_SIZE',
+        'METRICS_WORKER_LABEL',
+        'READ_DATABASE_URL',
+    ):
+        # setenv antes de delenv garante que o teardown restaura o ambiente
+        monkeypatch.setenv(name, '')
+        monkeypatch.delenv(name)
+
+    def run(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        serve.get_settings.cache_clear()
+        try:
+            serve.main()
+        finally:
+            serve.get_settings.cache_clear()
+        return calls[-1]
+
+    return run
+
+
+def test_main_configures_workers(run_main):
+    expected_workers = 2
+    expected_pool_size = 5
+    expected_max_overflow = 0
+    expected_max_requests = 1000
+
+    kwargs = run_main(
+        SERVER_WORKERS='2',
+        SERVER_MAX_REQUESTS='1000',
+        DB_CONNECTION_BUDGET='10',
+        DB_POOL_SIZE='5',
+        DB_MAX_OVERFLOW='10',
+    )
+
+    assert kwargs['workers'] == expected_workers
+    assert kwargs['loop'] == serve.event_loop()
+    assert kwargs['http'] == serve.http_protocol()
+    assert kwargs['limit_max_requests'] == expected_max_requests
+    assert os.environ['DB_POOL_SIZE'] == str(expected_pool_size)
+    assert os.environ['DB_MAX_OVERFLOW'] == str(expected_max_overflow)
+    assert os.environ['AUTH_CACHE_SIZE'] == '0'
+    assert os.environ['METRICS_WORKER_LABEL'] == 'true'
+
+
+def test_main_with_one_worker_never_recycles(run_main):
+    expected_workers = 1
+
+    kwargs = run_main(SERVER_WORKERS='1', SERVER_MAX_REQUESTS='1000')
+
+    assert kwargs['workers'] == expected_workers
+    assert kwargs['limit_max_requests'] is None
+    assert 'AUTH_CACHE_SIZE' not in os.environ
+    assert 'METRICS_WORKER_LABEL' not in os.environ
+
+
+def test_main_refuses_workers_with_read_your_writes(run_main):
+    with pytest.raises(SystemExit):
+        run_main(
+            SERVER_WORKERS='2',
+            READ_DATABASE_URL='postgresql+psycopg://replica/app',
+        )
@@ -1,23 +1,21 @@
+import csv
+import io
+import json
+from datetime import datetime
 from http import HTTPStatus
 
-import factory
-import factory.fuzzy
 import pytest
+from sqlalchemy import select
 from sqlalchemy.exc import StatementError
 
+from app_todo_list.importer import iter_lines
 from app_todo_list.models import Todo, TodoState
+from app_todo_list.pagination import encode_cursor
+from app_todo_list.routers.todos import settings
+from tests.factories import TodoFactory
 
 
-class TodoFactory(factory.Factory):
-    class Meta:
-        model = Todo
-
-    title = factory.Faker('text')
-    description = factory.Faker('text')
-    state = factory.fuzzy.FuzzyChoice(TodoState)
-    user_id = 1
-
-
+@pytest.mark.query_budget(2)
 def test_create_todo(client, token, mock_db_time):
     with mock_db_time(model=Todo) as time:
         todo = {
@@ -59,6 +57,7 @@ async def test_create_todo_with_invalid_state(session, user):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_read_todos_should_return_5_todos(client, user, token, session):
     excepted_todos = 5
     session.add_all(TodoFactory.create_batch(5, user_id=user.id))
@@ -73,6 +72,7 @@ async def test_read_todos_should_return_5_todos(client, user, token, session):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_read_todos_pagination_should_return_2_todos(
     client, user, token, session
 ):
@@ -89,6 +89,7 @@ async def test_read_todos_pagination_should_return_2_todos(
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_read_todos_filter_title_should_return_5_todos(
     client, user, token, session
 ):
@@ -113,6 +114,7 @@ async def test_read_todos_filter_title_should_return_5_todos(
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_read_todos_filter_description_should_return_5_todos(
     client, user, token, session
 ):
@@ -139,6 +141,7 @@ async def test_read_todos_filter_description_should_return_5_todos(
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_read_todos_filter_state_should_return_5_todos(
     client, user, token, session
 ):
@@ -164,6 +167,7 @@ async def test_read_todos_filter_state_should_return_5_todos(
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_delete_todo(client, user, token, session):
     todo = TodoFactory(user_id=user.id)
     session.add(todo)
@@ -179,6 +183,7 @@ async def test_delete_todo(client, user, token, session):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_delete_todo_not_found(client, token):
     response = client.delete(
         '/todos/1', headers={'Authorization': f'Bearer {token}'}
@@ -189,6 +194,7 @@ async def test_delete_todo_not_found(client, token):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_delete_todo_not_owner(client, other_user, token, session):
     todo_other_user = TodoFactory(user_id=other_user.id)
 
@@ -205,6 +211,7 @@ async def test_delete_todo_not_owner(client, other_user, token, session):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_patch_todo(client, user, token, session):
     todo = TodoFactory(user_id=user.id)
 
@@ -222,6 +229,7 @@ async def test_patch_todo(client, user, token, session):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_patch_todo_not_found(client, token):
     response = client.patch(
         '/todos/1',
@@ -234,6 +242,7 @@ async def test_patch_todo_not_found(client, token):
 
 
 @pytest.mark.asyncio
+@pytest.mark.query_budget(2)
 async def test_read_todos_should_return_all_expected_fields(
     session, client, user, token, mock_db_time
 ):
@@ -260,6 +269,7 @@ async def test_read_todos_should_return_all_expected_fields(
     ]
 
 
+@pytest.mark.query_budget(1)
 def test_read_todos_filter_min_length(client, token):
     tiny_string = 'a'
     response = client.get(
@@ -270,6 +280,7 @@ def test_read_todos_filter_min_length(client, token):
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
+@pytest.mark.query_budget(1)
 def test_read_todos_filter_max_length(client, token):
     large_string = 'a' * 22
     response = client.get(
@@ -278,3 +289,776 @@ def test_read_todos_filter_max_length(client, token):
     )
 
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todos_cursor_pagination(client, user, token, session):
+    expected_todos = 5
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    pages = []
+    response = client.get('/todos/?limit=2', headers=headers)
+    pages.append(response.json())
+    while pages[-1]['next_cursor']:
+        response = client.get(
+            '/todos/',
+            params={'limit': 2, 'cursor': pages[-1]['next_cursor']},
+            headers=headers,
+        )
+        pages.append(response.json())
+
+    ids = [todo['id'] for page in pages for todo in page['todos']]
+    assert [len(page['todos']) for page in pages] == [2, 2, 1]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids) == expected_todos
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todos_cursor_is_stable_with_new_rows(
+    client, user, token, session
+):
+    expected_todos = 2
+    session.add_all(TodoFactory.create_batch(4, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first_page = client.get('/todos/?limit=2', headers=headers).json()
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+    second_page = client.get(
+        '/todos/',
+        params={'limit': 2, 'cursor': first_page['next_cursor']},
+        headers=headers,
+    ).json()
+
+    first_ids = {todo['id'] for todo in first_page['todos']}
+    second_ids = {todo['id'] for todo in second_page['todos']}
+    assert first_ids.isdisjoint(second_ids)
+    assert len(second_ids) == expected_todos
+    assert second_page['next_cursor'] is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todos_cursor_with_state_filter(
+    client, user, token, session
+):
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.done)
+    )
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.todo)
+    )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first_page = client.get(
+        '/todos/?limit=2&state=done', headers=headers
+    ).json()
+    second_page = client.get(
+        '/todos/',
+        params={
+            'limit': 2,
+            'state': 'done',
+            'cursor': first_page['next_cursor'],
+        },
+        headers=headers,
+    ).json()
+
+    assert len(second_page['todos']) == 1
+    assert second_page['todos'][0]['state'] == 'done'
+    assert second_page['next_cursor'] is None
+
+
+@pytest.mark.query_budget(1)
+def test_read_todos_invalid_cursor(client, token):
+    response = client.get(
+        '/todos/?cursor=invalid',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.query_budget(1)
+def test_read_todos_cursor_and_offset(client, token):
+    cursor = encode_cursor(datetime(2026, 2, 11), 1)
+    response = client.get(
+        f'/todos/?cursor={cursor}&offset=1',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todos_filter_title_matches_substring(
+    client, user, token, session
+):
+    session.add(TodoFactory(user_id=user.id, title='Minha tarefa longa'))
+    session.add(TodoFactory(user_id=user.id, title='Outra coisa'))
+    await session.commit()
+
+    response = client.get(
+        '/todos/?title=tarefa',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert [todo['title'] for todo in response.json()['todos']] == [
+        'Minha tarefa longa'
+    ]
+
+
+@pytest.mark.query_budget(2)
+def test_create_todos_bulk(client, token, count_queries):
+    todos = [
+        {'title': f'todo {i}', 'description': 'bulk', 'state': 'doing'}
+        for i in range(5)
+    ]
+
+    with count_queries() as statements:
+        response = client.post(
+            '/todos/bulk',
+            headers={'Authorization': f'Bearer {token}'},
+            json=todos,
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert [todo['title'] for todo in response.json()] == [
+        todo['title'] for todo in todos
+    ]
+    assert all(todo['id'] for todo in response.json())
+    inserts = [s for s in statements if s.startswith('INSERT')]
+    assert len(inserts) == 1
+
+
+@pytest.mark.query_budget(1)
+def test_create_todos_bulk_too_many(client, token, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_BULK_MAX_SIZE', 2)
+    todos = [{'title': f'todo {i}', 'description': 'bulk'} for i in range(3)]
+
+    response = client.post(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json=todos,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {'detail': 'Máximo de 2 tarefas por requisição'}
+
+
+@pytest.mark.query_budget(1)
+def test_create_todos_bulk_empty(client, token):
+    response = client.post(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json=[],
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_patch_todos_bulk_by_ids(
+    client, user, token, session, count_queries
+):
+    todos = TodoFactory.create_batch(3, user_id=user.id, state=TodoState.todo)
+    session.add_all(todos)
+    await session.commit()
+    ids = [todos[0].id, todos[1].id]
+
+    with count_queries() as statements:
+        response = client.patch(
+            '/todos/bulk',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'ids': ids, 'changes': {'state': 'done'}},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    # A ordem das linhas do UPDATE ... RETURNING não é garantida
+    assert body['count'] == len(ids)
+    assert sorted(body['ids']) == sorted(ids)
+    assert [s.split()[0] for s in statements] == ['SELECT', 'UPDATE']
+    states = await session.scalars(select(Todo.state).order_by(Todo.id))
+    assert states.all() == [TodoState.done, TodoState.done, TodoState.todo]
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_patch_todos_bulk_by_state_is_owner_scoped(
+    client, user, other_user, token, session
+):
+    expected_count = 2
+    session.add_all(
+        TodoFactory.create_batch(2, user_id=user.id, state=TodoState.doing)
+    )
+    session.add(TodoFactory(user_id=other_user.id, state=TodoState.doing))
+    await session.commit()
+
+    response = client.patch(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'from_state': 'doing', 'changes': {'state': 'trash'}},
+    )
+
+    assert response.json()['count'] == expected_count
+    other_state = await session.scalar(
+        select(Todo.state).where(Todo.user_id == other_user.id)
+    )
+    assert other_state == TodoState.doing
+
+
+@pytest.mark.parametrize(
+    'payload',
+    [
+        {'changes': {'state': 'done'}},
+        {'ids': [1], 'changes': {}},
+    ],
+)
+@pytest.mark.query_budget(1)
+def test_patch_todos_bulk_invalid(client, token, payload):
+    response = client.patch(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json=payload,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_delete_todos_bulk_by_state(
+    client, user, other_user, token, session
+):
+    expected_count = 3
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.trash)
+    )
+    session.add(TodoFactory(user_id=user.id, state=TodoState.todo))
+    session.add(TodoFactory(user_id=other_user.id, state=TodoState.trash))
+    await session.commit()
+
+    response = client.delete(
+        '/todos/bulk?state=trash',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['count'] == expected_count
+    remaining = await session.scalars(select(Todo.user_id).order_by(Todo.id))
+    assert remaining.all() == [user.id, other_user.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_delete_todos_bulk_by_ids(client, user, token, session):
+    todos = TodoFactory.create_batch(2, user_id=user.id)
+    session.add_all(todos)
+    await session.commit()
+
+    response = client.delete(
+        f'/todos/bulk?ids={todos[0].id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.json() == {'count': 1, 'ids': [todos[0].id]}
+
+
+@pytest.mark.query_budget(1)
+def test_delete_todos_bulk_without_filter(client, token):
+    response = client.delete(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.query_budget(2)
+def test_create_todo_statement_count(client, token, count_queries):
+    expected_statements = 2
+
+    with count_queries() as statements:
+        client.post(
+            '/todos/',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'title': 'test', 'description': 'test', 'state': 'todo'},
+        )
+
+    assert len(statements) == expected_statements
+    assert 'RETURNING' in statements[-1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_delete_todo_single_statement(
+    client, user, token, session, count_queries
+):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    await session.commit()
+
+    with count_queries() as statements:
+        client.delete(
+            f'/todos/{todo.id}',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert [s.split()[0] for s in statements] == ['SELECT', 'DELETE']
+    assert await session.scalar(select(Todo).where(Todo.id == todo.id)) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_patch_todo_single_statement(
+    client, user, token, session, count_queries
+):
+    todo = TodoFactory(user_id=user.id, state=TodoState.todo)
+    session.add(todo)
+    await session.commit()
+
+    with count_queries() as statements:
+        response = client.patch(
+            f'/todos/{todo.id}',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'state': 'done'},
+        )
+
+    assert response.json()['state'] == 'done'
+    assert response.json()['title'] == todo.title
+    assert [s.split()[0] for s in statements] == ['SELECT', 'UPDATE']
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_patch_todo_not_owner(client, other_user, token, session):
+    todo = TodoFactory(user_id=other_user.id)
+    session.add(todo)
+    await session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'title': 'teste!'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Tarefa não encontrada'}
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todos_not_modified(client, user, token, session):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    etag = client.get('/todos/', headers=headers).headers['ETag']
+    response = client.get(
+        '/todos/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+    assert response.content == b''
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(3)
+async def test_read_todos_etag_changes_after_write(
+    client, user, token, session
+):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+    etag = client.get('/todos/', headers=headers).headers['ETag']
+
+    client.patch(f'/todos/{todo.id}', headers=headers, json={'title': 'novo'})
+    response = client.get(
+        '/todos/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] != etag
+    assert response.json()['todos'][0]['title'] == 'novo'
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(4)
+async def test_read_todos_etag_changes_with_total(
+    client, user, token, session
+):
+    session.add_all(TodoFactory.create_batch(2, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+    url = '/todos/?limit=1&count=exact'
+    etag = client.get(url, headers=headers).headers['ETag']
+    expected_total = 3
+
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+    response = client.get(url, headers={**headers, 'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['X-Total-Count'] == str(expected_total)
+
+
+@pytest.mark.query_budget(3)
+def test_read_todos_etag_depends_on_filter(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    etag = client.get('/todos/', headers=headers).headers['ETag']
+    response = client.get(
+        '/todos/?state=done', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todos_fast_serialization_matches_default(
+    client, user, token, session, monkeypatch
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+    default = client.get('/todos/?limit=2', headers=headers)
+
+    monkeypatch.setattr(settings, 'TODO_FAST_SERIALIZATION', True)
+    fast = client.get('/todos/?limit=2', headers=headers)
+
+    assert fast.status_code == HTTPStatus.OK
+    assert fast.headers['content-type'] == 'application/json'
+    assert fast.headers['ETag'] == default.headers['ETag']
+    assert fast.json() == default.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_export_todos_ndjson(client, user, token, session, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_EXPORT_BATCH_SIZE', 2)
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.done)
+    )
+    session.add(TodoFactory(user_id=user.id, state=TodoState.todo))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?state=done',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [line['state'] for line in lines] == ['done', 'done', 'done']
+    assert set(lines[0]) == {
+        'id',
+        'title',
+        'description',
+        'state',
+        'created_at',
+        'updated_at',
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_export_todos_csv(client, user, token, session):
+    todo = TodoFactory(user_id=user.id, title='exportar', state=TodoState.todo)
+    session.add(todo)
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.headers['content-disposition'] == (
+        'attachment; filename="todos.csv"'
+    )
+    assert len(rows) == 1
+    assert rows[0]['title'] == 'exportar'
+    assert rows[0]['state'] == 'todo'
+    assert rows[0]['id'] == str(todo.id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(1)
+async def test_import_todos_ndjson(client, user, token, session, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_BATCH_SIZE', 2)
+    lines = [
+        {'title': 'a', 'description': 'a', 'state': 'done'},
+        {'title': 'b', 'description': 'b'},
+        {'title': 'c'},
+        'não é json',
+        {'title': 'd', 'description': 'd', 'state': 'draft'},
+    ]
+    body = '\n'.join(
+        line if isinstance(line, str) else json.dumps(line) for line in lines
+    )
+
+    response = client.post(
+        '/todos/import',
+        content=body.encode(),
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/x-ndjson',
+        },
+    )
+
+    data = response.json()
+    expected_imported = 3
+    expected_failed = 2
+    assert response.status_code == HTTPStatus.OK
+    assert data['imported'] == expected_imported
+    assert data['failed'] == expected_failed
+    assert data['batches'] == [
+        {'batch': 1, 'rows': 2},
+        {'batch': 2, 'rows': 1},
+    ]
+    assert [error['line'] for error in data['errors']] == [3, 4]
+
+    todos = (
+        await session.scalars(
+            select(Todo).where(Todo.user_id == user.id).order_by(Todo.id)
+        )
+    ).all()
+    assert [(todo.title, todo.state) for todo in todos] == [
+        ('a', TodoState.done),
+        ('b', TodoState.todo),
+        ('d', TodoState.draft),
+    ]
+
+
+@pytest.mark.query_budget(2)
+def test_import_todos_csv(client, token):
+    body = (
+        'title,description,state\r\n'
+        'primeira,"com\nquebra de linha",doing\r\n'
+        'segunda,simples,estado\r\n'
+        'terceira,"com ""aspas""",done\r\n'
+    )
+
+    response = client.post(
+        '/todos/import?format=csv',
+        content=body.encode(),
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'text/csv',
+        },
+    )
+
+    data = response.json()
+    expected_imported = 2
+    expected_error_line = 4
+    assert data['imported'] == expected_imported
+    assert data['errors'][0]['line'] == expected_error_line
+    assert data['errors'][0]['detail'].startswith('state:')
+
+    exported = client.get(
+        '/todos/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert [row['description'] for row in rows] == [
+        'com\nquebra de linha',
+        'com "aspas"',
+    ]
+
+
+@pytest.mark.query_budget(1)
+def test_import_todos_caps_errors(client, token, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_MAX_ERRORS', 1)
+
+    response = client.post(
+        '/todos/import',
+        content=b'{}\n{}\n{}\n',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    data = response.json()
+    expected_failed = 3
+    assert data['failed'] == expected_failed
+    assert len(data['errors']) == 1
+    assert data['batches'] == []
+
+
+@pytest.mark.query_budget(1)
+def test_import_todos_reports_invalid_lines(client, token, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_MAX_LINE_BYTES', 64)
+    body = b'\n'.join([
+        b'{"title": "a", "description": "a"}',
+        b'{"title": "\xff"}',
+        b'{"title": "' + b'x' * 100 + b'"}',
+        b'{"title": "b", "description": "b"}',
+    ])
+
+    response = client.post(
+        '/todos/import',
+        content=body,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    data = response.json()
+    expected_imported = 2
+    assert response.status_code == HTTPStatus.OK
+    assert data['imported'] == expected_imported
+    assert data['errors'] == [
+        {'line': 2, 'detail': 'Linha não está em UTF-8'},
+        {'line': 3, 'detail': 'Linha maior que 64 bytes'},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_skips_long_lines_across_chunks(monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_MAX_LINE_BYTES', 4)
+
+    async def chunks():
+        for chunk in (b'ok\nlonga', b'demais', b'\nfim\r\n'):
+            yield chunk
+
+    lines = [line async for line in iter_lines(chunks())]
+
+    assert lines[0] == 'ok'
+    assert str(lines[1]) == 'Linha maior que 4 bytes'
+    assert lines[2:] == ['fim\r']
+
+
+@pytest.mark.query_budget(2)
+def test_import_todos_csv_keeps_carriage_returns_in_quotes(client, token):
+    body = 'title,description\r\nprimeira,"linha 1\r\nlinha 2"\r\n'
+
+    client.post(
+        '/todos/import?format=csv',
+        content=body.encode(),
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'text/csv',
+        },
+    )
+    response = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.json()['todos'][0]['description'] == 'linha 1\r\nlinha 2'
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(2)
+async def test_read_todo_stats(client, user, other_user, token, session):
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.done)
+    )
+    session.add_all(
+        TodoFactory.create_batch(
+            2, user_id=other_user.id, state=TodoState.todo
+        )
+    )
+    await session.commit()
+
+    client.patch(
+        '/todos/bulk',
+        json={
+            'from_state': 'done',
+            'ids': None,
+            'changes': {'state': 'doing'},
+        },
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    response = client.get(
+        '/todos/stats', headers={'Authorization': f'Bearer {token}'}
+    )
+    live = client.get(
+        '/todos/stats?live=true', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    expected_total = 3
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == live.json()
+    assert response.json() == {
+        'counts': {
+            'draft': 0,
+            'todo': 0,
+            'doing': expected_total,
+            'done': 0,
+            'trash': 0,
+        },
+        'total': expected_total,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(3)
+async def test_read_todos_total_count(client, user, token, session):
+    session.add_all(
+        TodoFactory.create_batch(4, user_id=user.id, state=TodoState.draft)
+    )
+    session.add_all(
+        TodoFactory.create_batch(
+            2, user_id=user.id, state=TodoState.done, title='achar'
+        )
+    )
+    await session.commit()
+
+    def total(query):
+        response = client.get(
+            f'/todos/?limit=1&{query}',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.headers.get('X-Total-Count')
+
+    expected_total = '6'
+    expected_draft = '4'
+    expected_title = '2'
+    assert total('') is None
+    assert total('count=none') is None
+    assert total('count=exact') == expected_total
+    assert total('count=exact&title=achar') == expected_title
+    assert total('count=estimated') == expected_total
+    assert total('count=estimated&state=draft') == expected_draft
+    assert int(total('count=estimated&title=achar')) >= 0
+
+
+@pytest.mark.query_budget(3)
+def test_read_todos_total_count_fast_serialization(client, token, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_FAST_SERIALIZATION', True)
+
+    response = client.get(
+        '/todos/?count=exact',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.headers['X-Total-Count'] == '0'
+    assert response.headers['ETag']
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(3)
+async def test_read_todos_estimated_count_uses_planner(
+    client, user, token, session, count_queries
+):
+    session.add(TodoFactory(user_id=user.id, title='achar'))
+    await session.commit()
+
+    with count_queries() as statements:
+        client.get(
+            '/todos/?count=estimated&title=achar',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert any(s.startswith('EXPLAIN (FORMAT JSON)') for s in statements)
+    assert not any('count(' in s for s in statements)
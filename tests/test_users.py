@@ -1,10 +1,15 @@
 from http import HTTPStatus
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
+from app_todo_list.models import Todo, TodoState, User
+from app_todo_list.routers import users
 from app_todo_list.schemas import UserPublic
 
 
+@pytest.mark.query_budget(2)
 def test_create_user(client):
     user_data = {
         'username': 'alice',
@@ -22,6 +27,7 @@ def test_create_user(client):
     }
 
 
+@pytest.mark.query_budget(1)
 def test_create_user_conflict_username(client, user):
 
     user_data = {
@@ -36,6 +42,7 @@ def test_create_user_conflict_username(client, user):
     assert response.json() == {'detail': 'Username já existe'}
 
 
+@pytest.mark.query_budget(1)
 def test_create_user_conflict_email(client, user):
 
     user_data = {
@@ -50,6 +57,7 @@ def test_create_user_conflict_email(client, user):
     assert response.json() == {'detail': 'Email já existe'}
 
 
+@pytest.mark.query_budget(2)
 def test_read_users(client, user, token):
     user_schema = UserPublic.model_validate(user).model_dump()
     response = client.get(
@@ -58,8 +66,33 @@ def test_read_users(client, user, token):
 
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {'users': [user_schema]}
+    assert 'X-Total-Count' not in response.headers
 
 
+@pytest.mark.query_budget(3)
+def test_read_users_exact_count(client, user, other_user, token):
+    response = client.get(
+        '/users/?count=exact&limit=1',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    expected_total = '2'
+    assert len(response.json()['users']) == 1
+    assert response.headers['X-Total-Count'] == expected_total
+
+
+@pytest.mark.query_budget(3)
+def test_read_users_estimated_count(client, user, token):
+    response = client.get(
+        '/users/?count=estimated',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert int(response.headers['X-Total-Count']) >= 0
+
+
+@pytest.mark.query_budget(2)
 def test_update_user(client, user, token):
     updated_user_data = {
         'username': 'bob',
@@ -80,6 +113,7 @@ def test_update_user(client, user, token):
     }
 
 
+@pytest.mark.query_budget(1)
 def test_update_user_unauthorized(client, other_user, token):
     updated_user_data = {
         'username': 'bob',
@@ -99,6 +133,7 @@ def test_update_user_unauthorized(client, other_user, token):
     }
 
 
+@pytest.mark.query_budget(2)
 def test_update_integrity_error(client, user, other_user, token):
     updated_user_data = {
         'username': 'bob',
@@ -116,6 +151,7 @@ def test_update_integrity_error(client, user, other_user, token):
     assert response.json() == {'detail': 'Username ou email ja cadastrado'}
 
 
+@pytest.mark.query_budget(2)
 def test_read_user(client, user, token):
     user_schema = UserPublic.model_validate(user).model_dump()
     response = client.get(
@@ -127,6 +163,7 @@ def test_read_user(client, user, token):
 
 
 @pytest.mark.parametrize('user_id', [2, 0, -1])
+@pytest.mark.query_budget(2)
 def test_read_user_not_found(client, user_id, token):
     response = client.get(
         f'/users/{user_id}', headers={'Authorization': f'Bearer {token}'}
@@ -138,6 +175,7 @@ def test_read_user_not_found(client, user_id, token):
     }
 
 
+@pytest.mark.query_budget(3)
 def test_delete_user(client, user, token):
     response = client.delete(
         f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
@@ -149,6 +187,7 @@ def test_delete_user(client, user, token):
     }
 
 
+@pytest.mark.query_budget(1)
 def test_delete_user_unauthorized(client, other_user, token):
 
     response = client.delete(
@@ -159,3 +198,128 @@ def test_delete_user_unauthorized(client, other_user, token):
     assert response.json() == {
         'detail': 'Não autorizado a deletar este usuário',
     }
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(3)
+async def test_delete_user_with_todos(client, session, user, token):
+    session.add(
+        Todo(
+            title='test',
+            description='test',
+            state=TodoState.todo,
+            user_id=user.id,
+        )
+    )
+    await session.commit()
+
+    response = client.delete(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert await session.scalar(select(Todo)) is None
+
+
+@pytest.mark.query_budget(2)
+def test_create_user_statements(client, count_queries):
+    with count_queries() as statements:
+        client.post(
+            '/users/',
+            json={
+                'username': 'alice',
+                'email': 'alice@example.com',
+                'password': 'secret',
+            },
+        )
+
+    expected_statements = 2
+    assert len(statements) == expected_statements
+    assert statements[0].startswith('SELECT users.username')
+    assert statements[1].startswith('INSERT INTO users')
+    assert 'RETURNING' in statements[1]
+
+
+@pytest.mark.query_budget(1)
+def test_create_user_conflict_skips_password_hash(client, user, monkeypatch):
+    async def fail_hash(password):
+        raise AssertionError
+
+    monkeypatch.setattr(users, 'get_password_hash_async', fail_hash)
+
+    response = client.post(
+        '/users/',
+        json={
+            'username': 'alice',
+            'email': user.email,
+            'password': 'secret',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+
+
+@pytest.mark.asyncio
+async def test_user_unique_constraint_names(session, user):
+    session.add(
+        User(username=user.username, email='alice@example.com', password='x')
+    )
+
+    with pytest.raises(IntegrityError) as error:
+        await session.commit()
+
+    assert error.value.orig.diag.constraint_name == 'users_username_key'
+
+
+@pytest.mark.query_budget(2)
+def test_update_user_statement_count(client, user, token, count_queries):
+    expected_statements = 2
+
+    with count_queries() as statements:
+        client.put(
+            f'/users/{user.id}',
+            json={
+                'username': 'bob',
+                'email': 'bob@example.com',
+                'password': 'secret',
+            },
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert len(statements) == expected_statements
+    assert statements[-1].startswith('UPDATE users')
+
+
+@pytest.mark.query_budget(2)
+def test_read_user_not_modified(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    etag = client.get(f'/users/{user.id}', headers=headers).headers['ETag']
+    response = client.get(
+        f'/users/{user.id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+
+
+@pytest.mark.query_budget(2)
+def test_read_user_etag_changes_after_update(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    etag = client.get(f'/users/{user.id}', headers=headers).headers['ETag']
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'bob',
+            'email': 'bob@example.com',
+            'password': 'secret',
+        },
+    )
+    response = client.get(
+        f'/users/{user.id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['username'] == 'bob'